@@ -1,197 +1,677 @@
+import asyncio
+import difflib
+import functools
+import hashlib
+import importlib.util
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+import httpx
 from google import genai
 # import google.generativeai as genai
-from google.genai import types
+from google.genai import errors, types
 from decouple import config
-from icecream import ic
-
-API_KEY = config("GEMINI_API_TOKEN")
+# local
+from github.cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+MODEL = "gemini-2.5-flash"
+THINKING_BUDGET = 0 # Disables thinking
+# commit messages are short, capping the output also caps the worst case latency
+MAX_OUTPUT_TOKENS = 512
+TEMPERATURE = 0.2
+# the commit review is a few paragraphs long
+ANALYSIS_MAX_OUTPUT_TOKENS = 1024
+REQUEST_TIMEOUT = 60_000 # milliseconds
+# httpx only negotiates HTTP/2 when the h2 package is installed
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+# Maximum Gemini requests in flight at once, keep it under the QPM limit of your tier
+MAX_CONCURRENT = int(config("GEMINI_MAX_CONCURRENCY", default=16))
+MAX_RETRIES = 6
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_SYNC_SEM = threading.BoundedSemaphore(MAX_CONCURRENT)
+# asyncio semaphores are bound to the loop they are used in, so keep one per loop
+_ASYNC_SEMS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+# Responses are cached on disk so the same prompt isn't paid for twice, set GIT_ANALYZER_NO_CACHE=1 to bypass it
+CACHE_ENABLED = not config("GIT_ANALYZER_NO_CACHE", default=False, cast=bool)
+CACHE_EXPIRE = 7 * 86400
+_cache = ResponseCache("~/.git-analyzer/llm_cache.sqlite3")
+# the latest responses are also kept in memory, so repeated clicks don't even touch sqlite
+MEMORY_CACHE_SIZE = 128
+_memory_cache: "OrderedDict[str, str]" = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
+WHITESPACE_COMMIT_MESSAGE = "style: adjust whitespace"
+
+BATCH_POLL_INTERVAL = 30
+BATCH_FINISHED_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+
+# Prompts are split in a static preamble and a small input template. The preamble is sent
+# as its own content part so the same prefix is repeated on every call, which lets Gemini's
+# implicit context caching reuse it.
+
+_ANALYZE_COMMITS_PREAMBLE = """You are a helpful and encouraging senior software engineer who is an expert in version control best practices.
+Your goal is to review a list of a developer's recent commit messages and provide feedback that is clear, constructive, and educational.
+You should analyze the commits as a whole to identify patterns and habits.
+Your tone should be supportive, aiming to help the developer grow.
+Recognize that this is a list of separate commits, not one single message.
+Based on this list, provide a summary of the developer's habits, structured exactly as follows:
+
+**Strengths:**
+- (A bullet point listing a specific strength, e.g., "Good use of conventional commit types like 'feat' and 'fix'.")
+- (Another bullet point for a strength.)
+
+**Weaknesses:**
+- (A bullet point listing a specific weakness, e.g., "Some commit subjects are too vague, like 'docs'.")
+- (Another bullet point for a weakness.)
+
+**Advice:**
+- (A bullet point with actionable advice directly related to a 'Con'. For example, "For 'docs' commits, specify what was documented, like 'docs: Add setup instructions to README'.")
+- (Another piece of advice.)
+
+Keep the entire review concise and under 20 lines.
+"""
+
+_ANALYZE_COMMITS_INPUT = """Here are the commits to analyze:
+{formatted_commits}
+"""
+
+_BEST_PRACTICE_PREAMBLE = """You are a Git expert specializing in writing perfect commit messages.
+Your task is to take a user's commit message and rewrite it to be an ideal example of a conventional commit.
+You must infer the correct type (e.g., feat, fix, docs, style, refactor, test, chore).
+The subject must be clear, concise, and written in the imperative mood (e.g., "Add feature" not "Added feature").
+Provide ONLY the rewritten, ideal commit message and absolutely no extra explanation or text.
+"""
+
+_BEST_PRACTICE_INPUT = """Here is the commit message to rewrite :
+
+{commit_message}
+"""
+
+_WRITE_COMMIT_PREAMBLE = """You are an expert programmer who writes concise, conventional Git commit messages.
+Your task is to take a user's description of their changes and convert it into a perfectly formatted commit message.
+
+Follow these rules strictly:
+1.  The output must follow the Conventional Commits specification.
+2.  Infer the correct type (`feat`, `fix`, `docs`, `style`, `refactor`, `test`, `chore`) from the description.
+3.  The subject line must be in the imperative mood (e.g., "Add feature," not "Added feature") and start with a lowercase letter.
+4.  If the description is detailed, add a blank line after the subject and write a brief body explaining the 'what' and 'why' in bullet points.
+5.  Your response must contain ONLY the formatted commit message and nothing else. Do not add any extra text like "Here is the commit message:".
+"""
+
+_WRITE_COMMIT_INPUT = """Here is the message :
+
+{message}
+"""
+
+_DIFF_COMMIT_PREAMBLE = """You are an expert programmer and a master of writing concise, conventional Git commit messages.
+Your task is to analyze the provided code changes (the 'old code' and the 'new code') and generate a perfectly formatted commit message that summarizes the changes.
+
+Follow these rules strictly:
+1.  The output must strictly follow the Conventional Commits specification.
+2.  Analyze the code diff to infer the correct commit type: `feat` (a new feature), `fix` (a bug fix), `docs` (documentation only changes), `style` (changes that do not affect the meaning of the code - white-space, formatting, etc.), `refactor` (a code change that neither fixes a bug nor adds a feature), `test` (adding missing tests or correcting existing tests), or `chore` (changes to the build process or auxiliary tools).
+3.  The subject line must be in the imperative mood (e.g., "refactor user authentication," not "refactored user authentication").
+4.  The subject line must not be capitalized and should be concise (ideally under 50 characters).
+5.  If the changes are non-trivial, add a blank line after the subject and write a brief body explaining the 'what' and 'why' of the changes. Use bullet points for clarity.
+6.  Crucially, your response must contain ONLY the formatted commit message and nothing else. Do not include any introductory text, explanations, or apologies.
+"""
+
+_DIFF_COMMIT_INPUT = """---
+Here is the old code:
+```
+{old_code}
+```
+
+---
+Here is the new code:
+```
+{new_code}
+```
+---
+"""
+
+_STAGED_COMMIT_PREAMBLE = """You are an expert software developer and an expert at writing concise, high-quality Git commit messages. Your task is to analyze a set of code changes and generate a commit message that follows the Conventional Commits specification.
+
+## CONTEXT
+The provided data contains all the file changes for the commit. The data is a JSON object where each key is a file path and the value is a list containing two strings: the content of the file BEFORE the change, and the content AFTER the change.
+
+- If a file was newly created, its "before" content will be an empty string.
+- If a file was deleted, its "after" content will be an empty string.
+
+## TASK
+1.  **Analyze the Diff:** Carefully examine the differences between the "before" and "after" content for all provided files to understand the overall purpose of the changes.
+2.  **Determine Intent:** Do not just list the changes. Your primary goal is to understand the *reason* for the change. Was it a new feature, a bug fix, a performance improvement, a code refactor, or documentation?
+3.  **Generate Commit Message:** Write a single, holistic commit message that summarizes the entire set of changes.
+
+## OUTPUT FORMAT
+The message MUST strictly follow the Conventional Commits specification.
+
+- **Format:** `<type>[optional scope]: <subject>`
+- The subject line must be 50 characters or less.
+- `<type>` must be one of: `feat`, `fix`, `refactor`, `chore`, `docs`, `style`, `test`, `perf`.
+- **Body (Optional):** If needed, provide a more detailed explanation of the changes after a single blank line. Explain the "why" behind the change, not the "how".
+- **Footer (Optional):** Use for breaking changes (`BREAKING CHANGE: ...`) or referencing issue numbers.
+"""
+
+_STAGED_COMMIT_INPUT = """## CODE CHANGES
+```json
+{staged_changes}
+```
+"""
+
+
+@functools.cache
+def _client() -> genai.Client:
+    """
+        Create the Gemini client on first use so importing the module stays cheap
+        the client is thread safe and shared, which keeps its connection pool warm
+    """
+    return genai.Client(
+        api_key=config("GEMINI_API_TOKEN"),
+        http_options=types.HttpOptions(
+            timeout=REQUEST_TIMEOUT,
+            headers={"Accept-Encoding" : "gzip"},
+            # one multiplexed connection instead of a handshake per parallel request
+            # the pool keeps a warm connection for every request the semaphore lets through
+            client_args={
+                "http2" : HTTP2_ENABLED,
+                "limits" : httpx.Limits(max_connections=MAX_CONCURRENT, max_keepalive_connections=MAX_CONCURRENT),
+            },
+        ),
+    )
+
+
+_CONFIG = types.GenerateContentConfig(
+    thinking_config=types.ThinkingConfig(thinking_budget=THINKING_BUDGET),
+    max_output_tokens=MAX_OUTPUT_TOKENS,
+    temperature=TEMPERATURE,
+)
+
+
+def _generation_config(max_output_tokens:int | None = None) -> types.GenerateContentConfig:
+    """Return the shared config, only copy it when the caller needs a longer output"""
+    if max_output_tokens is None :
+        return _CONFIG
+    return _CONFIG.model_copy(update={"max_output_tokens" : max_output_tokens})
+
+
+def _get_async_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore of the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _ASYNC_SEMS.get(loop)
+    if semaphore is None :
+        semaphore = _ASYNC_SEMS[loop] = asyncio.Semaphore(MAX_CONCURRENT)
+    return semaphore
+
+
+def _should_retry(error:errors.APIError , attempt:int) -> bool:
+    """Only rate limit and server errors are retried and only until MAX_RETRIES"""
+    return error.code in RETRYABLE_STATUS_CODES and attempt < MAX_RETRIES - 1
+
+
+def _backoff_delay(attempt:int) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, 2 ** attempt)
+
+
+def _cache_key(prompt:str | list[str] , generation_config:types.GenerateContentConfig) -> str:
+    """The cache key covers everything that changes the response"""
+    if isinstance(prompt, list) :
+        prompt = "\n".join(prompt)
+    settings = (
+        f"{MODEL}|{generation_config.thinking_config.thinking_budget}"
+        f"|{generation_config.max_output_tokens}|{generation_config.temperature}"
+    )
+    # blake2b is faster than sha256 on big diffs, and 16 bytes are plenty for a cache key
+    return hashlib.blake2b(f"{settings}|{prompt}".encode(), digest_size=16).hexdigest()
+
+
+def _remember_response(key:str , response:str) -> None:
+    """Put the response in the in-memory LRU, dropping the least recently used one when it's full"""
+    with _memory_cache_lock :
+        _memory_cache[key] = response
+        _memory_cache.move_to_end(key)
+        if len(_memory_cache) > MEMORY_CACHE_SIZE :
+            _memory_cache.popitem(last=False)
+
+
+def _get_cached_response(key:str) -> str | None:
+    if not CACHE_ENABLED :
+        return None
+    with _memory_cache_lock :
+        response = _memory_cache.get(key)
+        if response is not None :
+            _memory_cache.move_to_end(key)
+            return response
+    response = _cache.get(key)
+    if response is not None :
+        _remember_response(key, response)
+    return response
 
-client = genai.Client(api_key=API_KEY)
 
+def _set_cached_response(key:str , response:str) -> None:
+    if CACHE_ENABLED :
+        _remember_response(key, response)
+        _cache.set(key, response, expire=CACHE_EXPIRE)
 
-def generate_ai_response(prompt:str) -> str:
-    """A helper function to create AI respones with the entered prompts"""
-    try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                thinking_config=types.ThinkingConfig(thinking_budget=0) # Disables thinking
-            ),
-        )
 
-        return response.text.strip()
-    except Exception as e:
-        # The SDK will raise specific errors, but a general catch-all is fine for now
-        print(f"An error occurred while calling the Gemini API: {e}")
-        return "Error: Could not get analysis from AI."
+def _response_text(response:types.GenerateContentResponse) -> str:
+    """The text of the response, a blocked or empty candidate has none"""
+    if response.text is None :
+        feedback = response.prompt_feedback.block_reason if response.prompt_feedback else None
+        finish_reason = response.candidates[0].finish_reason if response.candidates else None
+        raise ValueError(f"Gemini returned no text (block reason: {feedback}, finish reason: {finish_reason})")
+    return response.text.strip()
 
 
-def analyze_commit_list_with_ai(commit_messages: list[str]) -> str:
+def _request_ai_response(prompt:str | list[str] , generation_config:types.GenerateContentConfig) -> str:
     """
-        sends a list of commit messages to gemini API to anaylze it
+        Call the Gemini API and retry on rate limit and server errors
+        the semaphore is taken for each attempt, a request waiting out its backoff doesn't hold a slot
     """
-    # The prompt remains the same, telling the AI its role and task.
-    if not commit_messages :
-        raise ValueError("commit messages must be entered")
-    
-    formatted_commits = "\n".join(f"- {msg.split('/')[-1].strip()}" for msg in commit_messages)
-    prompt = f"""
-        You are a helpful and encouraging senior software engineer who is an expert in version control best practices.
-        Your goal is to review a list of a developer's recent commit messages and provide feedback that is clear, constructive, and educational.
-        You should analyze the commits as a whole to identify patterns and habits.
-        Your tone should be supportive, aiming to help the developer grow.
-        Recognize that this is a list of separate commits, not one single message.
-        Based on this list, provide a summary of the developer's habits, structured exactly as follows:
+    for attempt in range(MAX_RETRIES):
+        try:
+            with _SYNC_SEM :
+                response = _client().models.generate_content(
+                    model=MODEL,
+                    contents=prompt,
+                    config=generation_config,
+                )
+            return _response_text(response)
+        except errors.APIError as e:
+            if not _should_retry(e, attempt):
+                logger.error(f"{e} happened while calling the Gemini API")
+                raise e
+            delay = _backoff_delay(attempt)
+            logger.warning(f"Gemini API returned {e.code}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+async def _arequest_ai_response(prompt:str | list[str] , generation_config:types.GenerateContentConfig) -> str:
+    """Async version of _request_ai_response"""
+    for attempt in range(MAX_RETRIES):
+        try:
+            async with _get_async_semaphore() :
+                response = await _client().aio.models.generate_content(
+                    model=MODEL,
+                    contents=prompt,
+                    config=generation_config,
+                )
+            return _response_text(response)
+        except errors.APIError as e:
+            if not _should_retry(e, attempt):
+                logger.error(f"{e} happened while calling the Gemini API")
+                raise e
+            delay = _backoff_delay(attempt)
+            logger.warning(f"Gemini API returned {e.code}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+def generate_ai_response(prompt:str | list[str] , max_output_tokens:int | None = None) -> str:
+    """
+        A helper function to create AI respones with the entered prompts
+        the prompt can be a list of parts (static preamble first) to benefit from prefix caching
+    """
+    generation_config = _generation_config(max_output_tokens)
+    key = _cache_key(prompt, generation_config)
+    cached_response = _get_cached_response(key)
+    if cached_response is not None :
+        return cached_response
+
+    response = _request_ai_response(prompt, generation_config)
+    _set_cached_response(key, response)
+    return response
 
-        **Strengths:**
-        - (A bullet point listing a specific strength, e.g., "Good use of conventional commit types like 'feat' and 'fix'.")
-        - (Another bullet point for a strength.)
 
-        **Weaknesses:**
-        - (A bullet point listing a specific weakness, e.g., "Some commit subjects are too vague, like 'docs'.")
-        - (Another bullet point for a weakness.)
+async def agenerate_ai_response(prompt:str | list[str] , max_output_tokens:int | None = None) -> str:
+    """Async version of generate_ai_response so several prompts can be awaited together"""
+    generation_config = _generation_config(max_output_tokens)
+    key = _cache_key(prompt, generation_config)
+    # sqlite is blocking, keep it off the event loop
+    cached_response = await asyncio.to_thread(_get_cached_response, key)
+    if cached_response is not None :
+        return cached_response
 
-        **Advice:**
-        - (A bullet point with actionable advice directly related to a 'Con'. For example, "For 'docs' commits, specify what was documented, like 'docs: Add setup instructions to README'.")
-        - (Another piece of advice.)
+    response = await _arequest_ai_response(prompt, generation_config)
+    await asyncio.to_thread(_set_cached_response, key, response)
+    return response
 
-        Keep the entire review concise and under 20 lines.
 
-        Here are the commits to analyze:
-        {formatted_commits}
+def _stream_ai_response(prompt:str | list[str] , generation_config:types.GenerateContentConfig) -> Iterator[str]:
+    """Yield the response chunks as Gemini generates them, cached responses are yielded at once"""
+    key = _cache_key(prompt, generation_config)
+    cached_response = _get_cached_response(key)
+    if cached_response is not None :
+        yield cached_response
+        return
+
+    chunks = []
+    last_chunk = None
+    for attempt in range(MAX_RETRIES):
+        try:
+            # the semaphore only covers opening the stream, it isn't held across yield
+            # so a caller that stops reading early doesn't keep a slot until the generator is collected
+            with _SYNC_SEM :
+                stream = _client().models.generate_content_stream(
+                    model=MODEL,
+                    contents=prompt,
+                    config=generation_config,
+                )
+                first_chunk = next(stream, None)
+            if first_chunk is None :
+                break
+            for chunk in itertools.chain((first_chunk,), stream):
+                last_chunk = chunk
+                if chunk.text :
+                    chunks.append(chunk.text)
+                    yield chunk.text
+            break
+        except errors.APIError as e:
+            # once a chunk reached the caller a retry would repeat it
+            if chunks or not _should_retry(e, attempt):
+                logger.error(f"{e} happened while calling the Gemini API")
+                raise e
+            delay = _backoff_delay(attempt)
+            logger.warning(f"Gemini API returned {e.code}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    response = "".join(chunks).strip()
+    if not response :
+        # the same error as the non streaming path, an empty response must not be cached for the other callers
+        feedback = last_chunk.prompt_feedback.block_reason if last_chunk is not None and last_chunk.prompt_feedback else None
+        finish_reason = last_chunk.candidates[0].finish_reason if last_chunk is not None and last_chunk.candidates else None
+        raise ValueError(f"Gemini returned no text (block reason: {feedback}, finish reason: {finish_reason})")
+    _set_cached_response(key, response)
+
+
+def generate_ai_response_stream(prompt:str | list[str] , collect:bool = False , max_output_tokens:int | None = None) -> Iterator[str] | str:
     """
+        Streaming version of generate_ai_response, the first chunk arrives long before the whole response
+        with collect the chunks are joined so it can be used as a drop-in replacement of generate_ai_response
+    """
+    chunks = _stream_ai_response(prompt, _generation_config(max_output_tokens))
+    if collect :
+        return "".join(chunks).strip()
+    return chunks
 
-    ai_response = generate_ai_response(prompt=prompt)
+
+def _analyze_commit_list_prompt(commit_messages: list[str]) -> list[str]:
+    """Build the prompt for analyzing a list of commit messages"""
+    if not commit_messages :
+        raise ValueError("commit messages must be entered")
     
-    return ai_response
+    # commits are saved as "<date>/<message>", only the message is sent
+    formatted_commits = "\n".join(["- " + msg.rpartition('/')[2].strip() for msg in commit_messages])
+    return [_ANALYZE_COMMITS_PREAMBLE, _ANALYZE_COMMITS_INPUT.format(formatted_commits=formatted_commits)]
 
 
-def commit_best_practice(commit_message:str) -> str :
+def analyze_commit_list_with_ai(commit_messages: list[str]) -> str:
     """
-        Send a commit message to gemini API to rewrite the commit message with the git best practices
+        sends a list of commit messages to gemini API to anaylze it
     """
+    prompt = _analyze_commit_list_prompt(commit_messages)
+    ai_response = generate_ai_response(prompt=prompt, max_output_tokens=ANALYSIS_MAX_OUTPUT_TOKENS)
+    
+    return ai_response
+
+
+async def aanalyze_commit_list_with_ai(commit_messages: list[str]) -> str:
+    """Async version of analyze_commit_list_with_ai"""
+    prompt = _analyze_commit_list_prompt(commit_messages)
+    return await agenerate_ai_response(prompt=prompt, max_output_tokens=ANALYSIS_MAX_OUTPUT_TOKENS)
+
+
+def _commit_best_practice_prompt(commit_message:str) -> list[str] :
+    """Build the prompt for rewriting a commit message with the git best practices"""
     
     if not commit_message :
         raise ValueError("commit message must be entered")
     
-    prompt = f"""
+    return [_BEST_PRACTICE_PREAMBLE, _BEST_PRACTICE_INPUT.format(commit_message=commit_message)]
 
-        You are a Git expert specializing in writing perfect commit messages.
-        Your task is to take a user's commit message and rewrite it to be an ideal example of a conventional commit.
-        You must infer the correct type (e.g., feat, fix, docs, style, refactor, test, chore).
-        The subject must be clear, concise, and written in the imperative mood (e.g., "Add feature" not "Added feature").
-        Provide ONLY the rewritten, ideal commit message and absolutely no extra explanation or text.
-        Here is the commit message to rewrite : 
-
-        {commit_message}
 
+def commit_best_practice(commit_message:str) -> str :
     """
-    
+        Send a commit message to gemini API to rewrite the commit message with the git best practices
+    """
+    prompt = _commit_best_practice_prompt(commit_message)
     ai_response = generate_ai_response(prompt=prompt)
     
     return ai_response
-    
-    
-def write_commit_message(message:str) -> str :
+
+
+async def acommit_best_practice(commit_message:str) -> str :
+    """Async version of commit_best_practice"""
+    prompt = _commit_best_practice_prompt(commit_message)
+    return await agenerate_ai_response(prompt=prompt)
+
+
+def stream_commit_best_practice(commit_message:str) -> Iterator[str] :
+    """Streaming version of commit_best_practice for interactive callers"""
+    prompt = _commit_best_practice_prompt(commit_message)
+    return generate_ai_response_stream(prompt=prompt)
+
+
+def map_commit_best_practice(commit_messages: list[str] , workers:int = MAX_CONCURRENT) -> list[str] :
     """
-        base on user changes from the message sends the message to gemini API to write the commit base on the commit best practices
+        Rewrite several commit messages using a thread pool, for callers that can't use the async batch functions
+        the calls share the GEMINI_MAX_CONCURRENCY limit and retry rate limit errors like the single calls
     """
+    with ThreadPoolExecutor(max_workers=workers) as executor :
+        return list(executor.map(commit_best_practice, commit_messages))
+
+
+def _write_commit_message_prompt(message:str) -> list[str] :
+    """Build the prompt for writing a commit message from the user's description"""
     
     if not message :
         raise ValueError("message must be entered")
     
-    prompt = f"""
-        You are an expert programmer who writes concise, conventional Git commit messages.
-        Your task is to take a user's description of their changes and convert it into a perfectly formatted commit message.
-
-        Follow these rules strictly:
-        1.  The output must follow the Conventional Commits specification.
-        2.  Infer the correct type (`feat`, `fix`, `docs`, `style`, `refactor`, `test`, `chore`) from the description.
-        3.  The subject line must be in the imperative mood (e.g., "Add feature," not "Added feature") and start with a lowercase letter.
-        4.  If the description is detailed, add a blank line after the subject and write a brief body explaining the 'what' and 'why' in bullet points.
-        5.  Your response must contain ONLY the formatted commit message and nothing else. Do not add any extra text like "Here is the commit message:".
-        Here is the message :
-        
-        {message}    
-    
+    return [_WRITE_COMMIT_PREAMBLE, _WRITE_COMMIT_INPUT.format(message=message)]
+
+
+def write_commit_message(message:str) -> str :
     """
-    
+        base on user changes from the message sends the message to gemini API to write the commit base on the commit best practices
+    """
+    prompt = _write_commit_message_prompt(message)
     response = generate_ai_response(prompt=prompt)
     
     return response
 
 
-def write_commit_base_on_diff(old_code:str , new_code:str) :
-    """Write commit message base on the changes of old and new code"""
-    
-    if not old_code and not new_code :
+async def awrite_commit_message(message:str) -> str :
+    """Async version of write_commit_message"""
+    prompt = _write_commit_message_prompt(message)
+    return await agenerate_ai_response(prompt=prompt)
+
+
+def stream_write_commit_message(message:str) -> Iterator[str] :
+    """Streaming version of write_commit_message for interactive callers"""
+    prompt = _write_commit_message_prompt(message)
+    return generate_ai_response_stream(prompt=prompt)
+
+
+def _validate_diff(old_code:str , new_code:str) -> str | None :
+    """
+        Check the old/new code before calling the API
+        returns the commit message when only blank lines were added or removed, they don't need the AI
+    """
+    if not old_code or not new_code :
         raise ValueError("Old/New codes must be entered")
 
-    prompt = f"""
-    You are an expert programmer and a master of writing concise, conventional Git commit messages.
-    Your task is to analyze the provided code changes (the 'old code' and the 'new code') and generate a perfectly formatted commit message that summarizes the changes.
-
-    Follow these rules strictly:
-    1.  The output must strictly follow the Conventional Commits specification.
-    2.  Analyze the code diff to infer the correct commit type: `feat` (a new feature), `fix` (a bug fix), `docs` (documentation only changes), `style` (changes that do not affect the meaning of the code - white-space, formatting, etc.), `refactor` (a code change that neither fixes a bug nor adds a feature), `test` (adding missing tests or correcting existing tests), or `chore` (changes to the build process or auxiliary tools).
-    3.  The subject line must be in the imperative mood (e.g., "refactor user authentication," not "refactored user authentication").
-    4.  The subject line must not be capitalized and should be concise (ideally under 50 characters).
-    5.  If the changes are non-trivial, add a blank line after the subject and write a brief body explaining the 'what' and 'why' of the changes. Use bullet points for clarity.
-    6.  Crucially, your response must contain ONLY the formatted commit message and nothing else. Do not include any introductory text, explanations, or apologies.
-
-    ---
-    Here is the old code:
-    ```
-    {old_code}
-    ```
-
-    ---
-    Here is the new code:
-    ```
-    {new_code}
-    ```
-    ---
+    if old_code == new_code :
+        raise ValueError("Old and new code are the same, there is nothing to commit")
+
+    if _only_blank_lines_changed(old_code, new_code) :
+        return WHITESPACE_COMMIT_MESSAGE
+    return None
+
+
+def _only_blank_lines_changed(old_code:str , new_code:str) -> bool :
     """
-    
+        True when every added or removed line of the diff is blank
+        indentation and spaces inside a line can change what the code does, so those still go to the AI
+    """
+    diff = difflib.unified_diff(old_code.splitlines(), new_code.splitlines(), n=0, lineterm="")
+    # the first two lines are the ---/+++ file headers
+    for line in itertools.islice(diff, 2, None) :
+        if line.startswith("@@") :
+            continue
+        if line[1:].strip() :
+            return False
+    return True
+
+
+def _strip_trailing_whitespace(code:str) -> str :
+    """
+        Trailing whitespace doesn't change the code, dropping it makes the prompt smaller
+        and lets a diff that only differs in it hit the response cache
+    """
+    return "\n".join(line.rstrip() for line in code.splitlines())
+
+
+def _write_commit_base_on_diff_prompt(old_code:str , new_code:str) -> list[str] :
+    """Build the prompt for writing a commit message from old and new code"""
+    return [
+        _DIFF_COMMIT_PREAMBLE,
+        _DIFF_COMMIT_INPUT.format(old_code=_strip_trailing_whitespace(old_code), new_code=_strip_trailing_whitespace(new_code))
+    ]
+
+
+def write_commit_base_on_diff(old_code:str , new_code:str) :
+    """Write commit message base on the changes of old and new code"""
+    trivial_message = _validate_diff(old_code, new_code)
+    if trivial_message is not None :
+        return trivial_message
+
+    prompt = _write_commit_base_on_diff_prompt(old_code, new_code)
     response = generate_ai_response(prompt=prompt)
     
     return response
 
 
-def write_commits_for_staged_changes(staged_changes:list[dict]) -> str :
-    """Write commit message for user's staged changes"""
+async def awrite_commit_base_on_diff(old_code:str , new_code:str) -> str :
+    """Async version of write_commit_base_on_diff"""
+    trivial_message = _validate_diff(old_code, new_code)
+    if trivial_message is not None :
+        return trivial_message
+
+    prompt = _write_commit_base_on_diff_prompt(old_code, new_code)
+    return await agenerate_ai_response(prompt=prompt)
+
+
+def _write_commits_for_staged_changes_prompt(staged_changes:list[dict]) -> list[str] :
+    """Build the prompt for writing a commit message for staged changes"""
     
     if not staged_changes :
         raise ValueError("Staged changes must be enetered")
     
-    prompt = f"""You are an expert software developer and an expert at writing concise, high-quality Git commit messages. Your task is to analyze a set of code changes and generate a commit message that follows the Conventional Commits specification.
+    # the prompt promises JSON, str() would send a python repr which also costs more tokens
+    payload = json.dumps(staged_changes, separators=(',', ':'), ensure_ascii=False)
+    return [_STAGED_COMMIT_PREAMBLE, _STAGED_COMMIT_INPUT.format(staged_changes=payload)]
+
+
+def write_commits_for_staged_changes(staged_changes:list[dict]) -> str :
+    """Write commit message for user's staged changes"""
+    prompt = _write_commits_for_staged_changes_prompt(staged_changes)
+    result = generate_ai_response(prompt=prompt)
+    
+    return result
+
+
+def write_commits_for_staged_changes_batch(groups:list[list[dict]]) -> list[str] :
+    """
+        Write one commit message per group of staged changes with the Gemini Batch API
+        batch jobs cost about half as much but can take minutes, use it for bulk work not interactive use
+    """
+    if not groups :
+        raise ValueError("Staged change groups must be entered")
+
+    inlined_requests = [
+        {
+            "contents" : [{"role" : "user", "parts" : [{"text" : part} for part in _write_commits_for_staged_changes_prompt(group)]}],
+            "config" : _CONFIG,
+        }
+        for group in groups
+    ]
+    job = _client().batches.create(
+        model=MODEL,
+        src=inlined_requests,
+        config={"display_name" : "git-analyzer-staged-commits"},
+    )
+    logger.info(f"Created Gemini batch job {job.name} for {len(groups)} groups")
+
+    while job.state.name not in BATCH_FINISHED_STATES :
+        time.sleep(BATCH_POLL_INTERVAL)
+        job = _client().batches.get(name=job.name)
+
+    if job.state.name != "JOB_STATE_SUCCEEDED" :
+        raise RuntimeError(f"Gemini batch job {job.name} finished with {job.state.name}")
+
+    results = []
+    for index, inlined_response in enumerate(job.dest.inlined_responses):
+        if inlined_response.error :
+            raise RuntimeError(f"Gemini batch job {job.name} failed for group {index}: {inlined_response.error}")
+        results.append(_response_text(inlined_response.response))
+    return results
+
+
+# Batch entry points, the requests run concurrently instead of one after another
+
+async def abatch_analyze_commit_lists(commit_lists: list[list[str]] , return_exceptions:bool = False) -> list[str] :
+    """
+        Analyze several commit lists concurrently
+        with return_exceptions the failed items are returned as exceptions instead of failing the whole batch
+    """
+    return await asyncio.gather(
+        *(aanalyze_commit_list_with_ai(commits) for commits in commit_lists),
+        return_exceptions=return_exceptions
+    )
+
 
-    ## CONTEXT
-    The provided data contains all the file changes for the commit. The data is a JSON object where each key is a file path and the value is a list containing two strings: the content of the file BEFORE the change, and the content AFTER the change.
+async def abatch_commit_best_practice(commit_messages: list[str] , return_exceptions:bool = False) -> list[str] :
+    """Rewrite several commit messages with the git best practices concurrently"""
+    return await asyncio.gather(
+        *(acommit_best_practice(message) for message in commit_messages),
+        return_exceptions=return_exceptions
+    )
 
-    - If a file was newly created, its "before" content will be an empty string.
-    - If a file was deleted, its "after" content will be an empty string.
 
-    ## TASK
-    1.  **Analyze the Diff:** Carefully examine the differences between the "before" and "after" content for all provided files to understand the overall purpose of the changes.
-    2.  **Determine Intent:** Do not just list the changes. Your primary goal is to understand the *reason* for the change. Was it a new feature, a bug fix, a performance improvement, a code refactor, or documentation?
-    3.  **Generate Commit Message:** Write a single, holistic commit message that summarizes the entire set of changes.
+async def abatch_write_commit_message(messages: list[str] , return_exceptions:bool = False) -> list[str] :
+    """Write commit messages for several change descriptions concurrently"""
+    return await asyncio.gather(
+        *(awrite_commit_message(message) for message in messages),
+        return_exceptions=return_exceptions
+    )
 
-    ## OUTPUT FORMAT
-    The message MUST strictly follow the Conventional Commits specification.
 
-    - **Format:** `<type>[optional scope]: <subject>`
-    - The subject line must be 50 characters or less.
-    - `<type>` must be one of: `feat`, `fix`, `refactor`, `chore`, `docs`, `style`, `test`, `perf`.
-    - **Body (Optional):** If needed, provide a more detailed explanation of the changes after a single blank line. Explain the "why" behind the change, not the "how".
-    - **Footer (Optional):** Use for breaking changes (`BREAKING CHANGE: ...`) or referencing issue numbers.
+async def abatch_write_commit_base_on_diff(diffs: list[tuple[str, str]] , return_exceptions:bool = False) -> list[str] :
+    """Write commit messages for several (old_code, new_code) pairs concurrently"""
+    return await asyncio.gather(
+        *(awrite_commit_base_on_diff(old_code, new_code) for old_code, new_code in diffs),
+        return_exceptions=return_exceptions
+    )
 
-    ## CODE CHANGES
-    ```json
-    {staged_changes}
+async def areview_developer(commit_messages: list[str]) -> dict :
     """
-    print(prompt)
-    result = generate_ai_response(prompt=prompt)
-    
-    return result
\ No newline at end of file
+        Analyze the commit list and rewrite every commit message at the same time
+        returns {"analysis": str, "rewrites": list[str]}, the fan-out is bounded by the shared semaphore
+    """
+    analysis, rewrites = await asyncio.gather(
+        aanalyze_commit_list_with_ai(commit_messages),
+        abatch_commit_best_practice([message.rpartition('/')[2].strip() for message in commit_messages]),
+    )
+    return {"analysis" : analysis, "rewrites" : rewrites}
\ No newline at end of file
@@ -0,0 +1,50 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class ResponseCache:
+    """A small sqlite backed key/value store with expiration, used to persist AI responses between runs"""
+
+    def __init__(self , path:str) -> None:
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._connection : Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use so importing the module doesn't touch the disk"""
+        if self._connection is None :
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # the lock serializes access, so the connection can be shared by worker threads
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        return self._connection
+
+    def get(self , key:str) -> Optional[str]:
+        """Return the cached value or None if it's missing or expired"""
+        with self._lock :
+            connection = self._connect()
+            row = connection.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None :
+                return None
+
+            value, expires_at = row
+            if expires_at < time.time() :
+                with connection :
+                    connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            return value
+
+    def set(self , key:str , value:str , expire:float) -> None:
+        """Store the value for `expire` seconds"""
+        with self._lock :
+            connection = self._connect()
+            with connection :
+                connection.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, time.time() + expire)
+                )
@@ -7,104 +7,258 @@ Features a multi-page layout and asynchronous operations to prevent UI freezing.
 
 import sys
 import os
-import requests
-import re
-import traceback
-from typing import Optional, Tuple, Dict, List
+import subprocess
+import codecs
+import threading
+import hashlib
+import functools
+import logging
+import importlib.util
+from enum import IntEnum
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Tuple, Dict, List
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from decouple import config
 
+logger = logging.getLogger(__name__)
+
 # --- GitPython Import ---
 # This is now a hard dependency for the local features.
-try:
-    from git import Repo, InvalidGitRepositoryError
-except ImportError:
+# it's only looked up here, GitRepo imports it the first time a project folder is opened so startup doesn't load it
+if importlib.util.find_spec("git") is None:
     print("FATAL ERROR: GitPython is not installed. Please run 'pip install GitPython'")
     sys.exit(1)
+if TYPE_CHECKING:
+    from git import Repo
+
+# --- Optional pygit2 Import ---
+# libgit2 computes the whole status in one pass, much faster on big repositories.
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
 
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QGridLayout, QWidget,
     QLabel, QLineEdit, QPushButton, QComboBox, QGroupBox, QMessageBox, QStatusBar,
-    QFrame, QStyle, QListWidget, QTextEdit, QStackedWidget, QFileDialog
+    QStyle, QListWidget, QTextEdit, QStackedWidget, QFileDialog
 )
-from PyQt6.QtCore import Qt, QTimer, QObject, pyqtSignal, pyqtSlot, QRunnable, QThreadPool
-from PyQt6.QtGui import QIcon, QPixmap, QFontDatabase, QTextCursor
+from PyQt6.QtCore import Qt, QTimer, QObject, QUrl, QBuffer, QIODevice, QStandardPaths, pyqtSignal, pyqtSlot, QRunnable, QThreadPool
+from PyQt6.QtGui import QImage, QImageReader, QPixmap, QPixmapCache, QTextCursor
+from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
 
 # --- Import the actual logic handlers ---
 try:
     # Assuming these are in a 'github' directory relative to the script
-    from github.handler import GithubProfile, GithubRepo, GithubCommit
-    from github.ai_analyzer import analyze_commit_list_with_ai, commit_best_practice, write_commit_message, write_commit_base_on_diff, write_commits_for_staged_changes
+    from github.handler import GithubProfile, GithubRepo, GithubCommit, SESSION as GITHUB_SESSION
+    from github.ai_analyzer import analyze_commit_list_with_ai, commit_best_practice, write_commit_message, write_commit_base_on_diff, write_commits_for_staged_changes, stream_write_commit_message
 except ImportError:
     print("Warning: A remote handler was not found. Using mock classes for GUI demonstration.")
+    GITHUB_SESSION = None
+    # the mock delays wait on this event, closing the window sets it so pending mocks return at once
+    _mock_cancelled = threading.Event()
+    def _mock_delay(seconds): _mock_cancelled.wait(seconds)
     class GithubProfile:
         def __init__(self):
             self.avatar = None
-        def test_github_connection(self, token): import time; time.sleep(1); return True
+        def test_github_connection(self, token): _mock_delay(1); return True
         def _set_owner_name(self, token):
             self.avatar = 'https://placehold.co/50x50/2dd4bf/1f2937?text=U'
             return "mock_user"
     class GithubRepo:
         def get_user_repositories(self, token, owner): 
-            import time; time.sleep(1)
+            _mock_delay(1)
             return [
-                {"mock_user/modern-ui-project": "https://..."},
-                {"mock_user/api-backend": "https://..."},
-                {"mock_user/learning-python": "https://..."}
+                ("mock_user/modern-ui-project", "https://..."),
+                ("mock_user/api-backend", "https://..."),
+                ("mock_user/learning-python", "https://...")
             ]
-    @dataclass
     class GithubCommit:
-        def get_repo_commits(self, token:str, owner:str, repo:str) -> list:
-            import time; time.sleep(1.5)
+        etag = None
+        not_modified = False
+        def get_repo_commits(self, token:str, owner:str, repo:str, etag=None, all_pages=True) -> list:
+            _mock_delay(1.5)
             return ["feat: Add user authentication service", "fix: Resolve alignment issue on dashboard cards", "docs: Update API endpoint documentation"]
     
     def analyze_commit_list_with_ai(commit_messages: list[str]) -> str:
-        import time; time.sleep(2)
+        _mock_delay(2)
         return "**Overall Analysis:**\n- Good use of conventional commits."
     def commit_best_practice(commit_message: str) -> str:
-        import time; time.sleep(1)
+        _mock_delay(1)
         return f"fix: Correct alignment on dashboard cards"
     def write_commit_message(message: str) -> str:
-        import time; time.sleep(1.5)
+        _mock_delay(1.5)
         return f"feat: Implement new feature based on user description\n\n- Added logic for {message.split()[0]}\n- Updated UI components"
+    def stream_write_commit_message(message: str):
+        for line in write_commit_message(message).splitlines(keepends=True):
+            _mock_delay(0.3)
+            yield line
     def write_commit_base_on_diff(old_code: str, new_code: str) -> str:
-        import time; time.sleep(2)
+        _mock_delay(2)
         return "refactor: Simplify logic in main function\n\n- Replaced complex loop with list comprehension for clarity.\n- Removed redundant variable assignments."
     def write_commits_for_staged_changes(staged_changes:dict) -> str:
-        import time; time.sleep(2)
+        _mock_delay(2)
         num_files = len(staged_changes)
         return f"feat: Update {num_files} files\n\n- Refactored core logic for performance.\n- Updated documentation and tests."
 
 
+# pygit2 status flags mapped to the change types GitPython reports
+if pygit2 is not None:
+    _PYGIT2_INDEX_FLAGS = (
+        (pygit2.GIT_STATUS_INDEX_NEW, "A"),
+        (pygit2.GIT_STATUS_INDEX_MODIFIED, "M"),
+        (pygit2.GIT_STATUS_INDEX_DELETED, "D"),
+        (pygit2.GIT_STATUS_INDEX_RENAMED, "R"),
+        (pygit2.GIT_STATUS_INDEX_TYPECHANGE, "T"),
+    )
+    _PYGIT2_WORKTREE_FLAGS = (
+        (pygit2.GIT_STATUS_WT_NEW, "A"),
+        (pygit2.GIT_STATUS_WT_MODIFIED, "M"),
+        (pygit2.GIT_STATUS_WT_DELETED, "D"),
+        (pygit2.GIT_STATUS_WT_RENAMED, "R"),
+        (pygit2.GIT_STATUS_WT_TYPECHANGE, "T"),
+    )
+
+
+# The staged list and the staged contents only depend on HEAD and the index, so they're reused until one of them changes
+# set GIT_ANALYZER_NO_STATUS_CACHE=1 to compute them every time
+STATUS_CACHE_ENABLED = not config("GIT_ANALYZER_NO_STATUS_CACHE", default=False, cast=bool)
+
+# After connecting, the commits of the first repos are loaded in the background before one is picked
+# only their first page is fetched, and at most PREFETCH_WORKERS at once to stay far from the GitHub secondary rate limit
+PREFETCH_COMMITS_REPOS = 10
+PREFETCH_WORKERS = 4
+
+# Print the traceback of failed background tasks, set GIT_ANALYZER_DEBUG=1 to turn it on
+DEBUG = config("GIT_ANALYZER_DEBUG", default=False, cast=bool)
+
+class Page(IntEnum):
+    """Indexes of the pages in the stacked widget"""
+    ANALYZE = 0
+    DIFF = 1
+    LOCAL = 2
+
+
+STYLESHEET_PATH = Path(__file__).parent / "resources" / "app.qss"
+
+
+@functools.lru_cache(maxsize=1)
+def _load_stylesheet() -> str:
+    """Read the app stylesheet once, every window after the first reuses the same string"""
+    return STYLESHEET_PATH.read_text(encoding="utf-8")
+
+
 # --- User-Provided GitRepo Class ---
 @dataclass
 class GitRepo:
-    _repo : Repo = None
+    """
+    Local repository used by the local changes page
+    `_repo` is the worktree Repo used for the status and for staging, unstaging and committing
+    blob contents are read in one go through a `git cat-file --batch` process
+    """
+    _repo : "Repo" = None
+    _repo_path : str = None
+    _pygit2_repo : object = None
     staged_files : list = None
-    staged_files_repo : list = None
     file_blobs : list[dict] = None
+    # (HEAD sha, index mtime, index size) the staged lists were computed for
+    _staged_key : tuple = None
+    # the decoded staged blobs and the staged key they were read for
+    _combined_blobs : dict = None
+    _blobs_key : tuple = None
+
+    # blobs are decoded in chunks of this size
+    _BLOB_CHUNK_SIZE = 64 * 1024
+    # the AI only needs the start of big files, anything after this is cut
+    _MAX_BLOB_BYTES = 64 * 1024
+    # files bigger than this aren't read at all
+    _SKIP_BLOB_BYTES = 1 << 20
+    # a NUL byte in the first bytes means a binary file, the same check git uses
+    _BINARY_SNIFF_BYTES = 4096
+    _TRUNCATED_MARKER = "\n...<truncated>...\n"
         
     def _repo_init(self , path:str) -> Tuple[list, list]:
         """
         Initializes the repo object and fetches the initial status.
         """
+        self._repo = self._repo_for(path)
+        key = self._get_staged_key()
+        staged_cached = STATUS_CACHE_ENABLED and key == self._staged_key and self.staged_files is not None
+        if not staged_cached:
+            self._staged_key = None
+
+        if pygit2 is not None:
+            staged, unstaged = self._get_status_pygit2()
+        else:
+            staged = self.staged_files if staged_cached else self._get_stage_files()
+            unstaged = self._get_unstaged_files()
+        self._staged_key = key
+        return staged, unstaged
+
+    def _get_staged_key(self) -> tuple:
+        """
+        Cheap fingerprint of what the staged changes depend on
+        every stage, unstage or commit rewrites the index, so its mtime changes with them
+        """
+        index_stat = os.stat(os.path.join(self._repo.git_dir, "index"))
+        return self._repo.head.commit.hexsha, index_stat.st_mtime_ns, index_stat.st_size
+
+    def _get_status_pygit2(self) -> Tuple[list, list]:
+        """Get the staged and unstaged files with a single libgit2 status call"""
+        if self._pygit2_repo is None:
+            self._pygit2_repo = pygit2.Repository(self._repo.working_tree_dir)
+
+        staged, unstaged = [], []
+        for file_path, flags in self._pygit2_repo.status().items():
+            for flag, change_type in _PYGIT2_INDEX_FLAGS:
+                if flags & flag:
+                    staged.append({"file_name": file_path, "change_type": change_type})
+                    break
+            for flag, change_type in _PYGIT2_WORKTREE_FLAGS:
+                if flags & flag:
+                    unstaged.append({"file_name": file_path, "change_type": change_type})
+                    break
+        self.staged_files = staged
+        return staged, unstaged
+
+    def _repo_for(self, path:str) -> "Repo":
+        """
+        Return the Repo of the path, it's only opened again when the path changes
+        opening it walks the parent directories and reads the git config every time
+        """
+        if self._repo is not None and path == self._repo_path:
+            return self._repo
+
         if not path:
             raise ValueError("Path must be valid")
         
         if not self._directory_exist(path):
             raise FileNotFoundError("Invalid directory path")
             
+        from git import Repo, InvalidGitRepositoryError
         try:
-            self._repo = Repo(path, search_parent_directories=True)
+            repo = Repo(path, search_parent_directories=True)
         except InvalidGitRepositoryError:
             raise InvalidGitRepositoryError("Selected folder isn't a valid Git repository")
-        
-        self._get_stage_changes()
-        
-        staged = self._get_stage_files()
-        unstaged = self._get_unstaged_files()
-        return staged, unstaged
+
+        self._repo_path = path
+        return repo
+
+    def reset_cache(self) -> None:
+        """Forget the opened repo, e.g. when another project folder is selected"""
+        self._repo = None
+        self._repo_path = None
+        self._pygit2_repo = None
+        self.staged_files = None
+        self._staged_changed()
+
+    def _staged_changed(self) -> None:
+        """Drop everything computed from the staged changes"""
+        self._staged_key = None
+        self._combined_blobs = None
+        self._blobs_key = None
 
     def _directory_exist(self , path:str) -> bool:
         """Check that path exists or not"""
@@ -112,9 +266,8 @@ class GitRepo:
             
     def _get_stage_files(self) -> list:
         """get the file name of staged changes with the change type"""
-        staged_changes = self._repo.index.diff(self._repo.head.commit)
         files = []
-        for diff in staged_changes:
+        for diff in self._staged_diffs():
             files.append({
                 "file_name" : diff.b_path or diff.a_path,
                 "change_type" : diff.change_type
@@ -122,9 +275,12 @@ class GitRepo:
         self.staged_files = files
         return files
     
-    def _get_stage_changes(self):
-        """Get the stage changes to write commit base on them"""
-        self.staged_files_repo = list(self._repo.index.diff(self._repo.head.commit))
+    def _staged_diffs(self):
+        """
+        Diff the index against HEAD to write commits base on the stage changes
+        the diffs are produced again on every call instead of being kept, they hold on to their blobs
+        """
+        return self._repo.index.diff(self._repo.head.commit)
 
     def _get_unstaged_files(self) -> list:
         """Get unstaged files list"""
@@ -132,9 +288,12 @@ class GitRepo:
         for diff in self._repo.index.diff(None):
             unstaged_changes.append({"file_name": diff.b_path or diff.a_path, "change_type": diff.change_type})
         
+        # a set makes the duplicate check O(1) instead of scanning the list for every untracked file
+        unstaged_names = {f['file_name'] for f in unstaged_changes}
         for file_path in self._repo.untracked_files:
-            if not any(f['file_name'] == file_path for f in unstaged_changes):
+            if file_path not in unstaged_names:
                 unstaged_changes.append({"file_name": file_path, "change_type": "A"})
+                unstaged_names.add(file_path)
         return unstaged_changes
     
     def _add_to_stage(self, file_name:str):
@@ -142,16 +301,15 @@ class GitRepo:
         if not file_name:
             raise ValueError("File name is not valid")
         self._repo.index.add([file_name])
+        self._staged_changed()
         return True
         
     def _add_all_to_stage(self) -> None:
         """Stage all files"""
-        # GitPython's add with `all=True` is not what we want.
-        # We need to add all tracked but modified files, and all untracked files.
-        unstaged = self._get_unstaged_files()
-        files_to_add = [item['file_name'] for item in unstaged]
-        if files_to_add:
-            self._repo.index.add(files_to_add)
+        # one `git add -A` stages modified, deleted and untracked files
+        # without listing them first and passing every path along
+        self._repo.git.add(A=True)
+        self._staged_changed()
         return True
         
     def _remove_from_stage(self, file_name:str) -> None:
@@ -159,6 +317,7 @@ class GitRepo:
         if not file_name:
             raise ValueError("File name is not valid")
         self._repo.index.reset(paths=[file_name])
+        self._staged_changed()
         return True
     
     def _remove_all_from_stage(self) -> None:
@@ -166,37 +325,103 @@ class GitRepo:
         if not self._repo:
             raise ValueError("Repo must be initialized")
         self._repo.index.reset()
+        self._staged_changed()
         return True
     
-    def decode_blob(self, diff:object) -> Tuple[str, str]:
-        """Decode a & b blobs to strings"""
-        old_content = ""
-        new_content = ""
-        try:
-            old_content = diff.a_blob.data_stream.read().decode('utf-8', 'ignore') if diff.a_blob else "New added"
-        except Exception: pass
+    def _read_blobs(self, hexshas) -> Dict[str, str]:
+        """
+        Read and decode the blobs through a single `git cat-file --batch` process
+        instead of a lookup per object, each sha is written and its output read before the next one so neither pipe fills up
+        """
+        contents = {}
+        process = self._repo.git.cat_file("--batch", as_process=True, istream=subprocess.PIPE)
         try:
-            new_content = diff.b_blob.data_stream.read().decode('utf-8', 'ignore') if diff.b_blob else "Deleted"
-        except Exception: pass
+            for hexsha in hexshas:
+                if hexsha in contents:
+                    continue
+                process.stdin.write(hexsha.encode() + b"\n")
+                process.stdin.flush()
+                # "<sha> blob <size>" or "<sha> missing"
+                header = process.stdout.readline().split()
+                if len(header) != 3:
+                    contents[hexsha] = ""
+                    continue
+                contents[hexsha] = self._decode_blob_stream(process.stdout, int(header[2]))
+                # the content is followed by a newline
+                process.stdout.read(1)
+        finally:
+            process.stdin.close()
+            process.wait()
+        return contents
+
+    def _skip_bytes(self, stream, size:int) -> None:
+        """Read and drop the rest of a blob that isn't used"""
+        while size > 0 and (chunk := stream.read(min(self._BLOB_CHUNK_SIZE, size))):
+            size -= len(chunk)
+
+    def _decode_blob_stream(self, stream, size:int) -> str:
+        """
+        Decode the next `size` bytes of the stream chunk by chunk so the whole file isn't held as bytes and str at once
+        only the first _MAX_BLOB_BYTES are decoded, the rest is read and dropped to keep the stream in step
+        """
+        if size > self._SKIP_BLOB_BYTES:
+            self._skip_bytes(stream, size)
+            return f"<file too large to analyze: {size} bytes>"
+
+        head = stream.read(min(size, self._BINARY_SNIFF_BYTES))
+        if b'\x00' in head:
+            self._skip_bytes(stream, size - len(head))
+            return f"<binary file: {size} bytes>"
+
+        decoder = codecs.getincrementaldecoder('utf-8')('ignore')
+        parts = [decoder.decode(head)]
+        remaining = size - len(head)
+        budget = self._MAX_BLOB_BYTES - len(head)
+        while remaining > 0 and (chunk := stream.read(min(self._BLOB_CHUNK_SIZE, remaining))):
+            remaining -= len(chunk)
+            if budget > 0:
+                parts.append(decoder.decode(chunk[:budget]))
+                budget -= len(chunk)
+        parts.append(decoder.decode(b'', final=True))
+
+        if size > self._MAX_BLOB_BYTES:
+            parts.append(self._TRUNCATED_MARKER)
+        return ''.join(parts)
+
+    def decode_blob(self, diff:object, contents:Dict[str, str]) -> Tuple[str, str]:
+        """Look up the decoded a & b blobs of the diff"""
+        old_content = contents.get(diff.a_blob.hexsha, "") if diff.a_blob else "New added"
+        new_content = contents.get(diff.b_blob.hexsha, "") if diff.b_blob else "Deleted"
         return old_content, new_content
 
     def _combine_all_blobs(self) -> dict:
-        """Combine all diffs to analyze the staged changes commits"""
-        combined_diffs = {}
-        for diff in self.staged_files_repo:
-            file_path = diff.b_path or diff.a_path
-            if not file_path:
-                continue
-            
-            old_content, new_content = self.decode_blob(diff)
-            combined_diffs[file_path] = {"old": old_content, "new": new_content}
-        return combined_diffs
+        """
+        Combine all diffs to analyze the staged changes commits
+        the result is reused until HEAD or the index changes
+        """
+        key = self._get_staged_key()
+        if STATUS_CACHE_ENABLED and key == self._blobs_key and self._combined_blobs is not None:
+            return self._combined_blobs
+        self._combined_blobs = self._read_staged_blobs()
+        self._blobs_key = key
+        return self._combined_blobs
+
+    def _read_staged_blobs(self) -> dict:
+        """Decode the old and new content of every staged file"""
+        items = [(diff.b_path or diff.a_path, diff) for diff in self._staged_diffs() if diff.b_path or diff.a_path]
+        if not items:
+            return {}
+
+        contents = self._read_blobs(blob.hexsha for _, diff in items for blob in (diff.a_blob, diff.b_blob) if blob is not None)
+        results = ((file_path, self.decode_blob(diff, contents)) for file_path, diff in items)
+        return {file_path: {"old": old_content, "new": new_content} for file_path, (old_content, new_content) in results}
 
     def _commit(self, message: str) -> bool:
         """Commits the staged changes with the given message."""
         if not message:
             raise ValueError("Commit message cannot be empty.")
         self._repo.index.commit(message)
+        self._staged_changed()
         return True
 
 # --- Custom Widget for Plain Text Pasting ---
@@ -209,8 +434,9 @@ class CodeTextEdit(QTextEdit):
 # --- Worker Thread for Asynchronous Operations ---
 class WorkerSignals(QObject):
     finished = pyqtSignal()
-    error = pyqtSignal(tuple)
+    error = pyqtSignal(object)
     result = pyqtSignal(object)
+    progress = pyqtSignal(object)
 
 class Worker(QRunnable):
     def __init__(self, fn, *args, **kwargs):
@@ -219,14 +445,22 @@ class Worker(QRunnable):
         self.args = args
         self.kwargs = kwargs
         self.signals = WorkerSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        """The task can't be interrupted, but its result is dropped instead of reaching a closed window"""
+        self.cancelled = True
 
     @pyqtSlot()
     def run(self):
         try:
             result = self.fn(*self.args, **self.kwargs)
-            self.signals.result.emit(result)
+            if not self.cancelled:
+                self.signals.result.emit(result)
         except Exception as e:
-            self.signals.error.emit((type(e), e, traceback.format_exc()))
+            if not self.cancelled:
+                # only the exception is sent, the traceback is formatted by the receiver if it's needed
+                self.signals.error.emit(e)
         finally:
             self.signals.finished.emit()
 
@@ -242,6 +476,9 @@ class GitAnalyzerGUI(QMainWindow):
         self.local_git_repo = GitRepo()
         
         self.current_project_path = None
+        # the diff page is only built the first time it's opened
+        self.diff_page = None
+        self.generate_from_diff_btn = None
         self.stage_selected_btn = None
         self.stage_all_btn = None
         self.unstage_selected_btn = None
@@ -253,6 +490,28 @@ class GitAnalyzerGUI(QMainWindow):
         self.commit_staged_btn = None
         self.generated_staged_commit_text = None
 
+        # GitHub/AI results of this session, cleared on disconnect
+        self._repo_cache: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        # (owner, repo) -> (etag, commits)
+        self._commits_cache: Dict[Tuple[str, str], Tuple[Optional[str], list]] = {}
+        self._ai_cache: Dict[str, str] = {}
+        # the commits shown in the list and their AI cache key, computed on the first analysis
+        self._current_commit_texts: List[str] = []
+        self._current_commits_key: Optional[str] = None
+        # the avatar is fetched by Qt's own async network stack
+        self._network_manager = QNetworkAccessManager(self)
+
+        # the tasks are I/O bound, so allow more threads than cores (same as ThreadPoolExecutor's old default)
+        QThreadPool.globalInstance().setMaxThreadCount(min(32, (os.cpu_count() or 1) * 5))
+        # started workers, so they can be cancelled when the window closes
+        self._active_workers = set()
+        # task_key of the tasks that are running, see run_task_in_thread
+        self._tasks_in_flight = set()
+        # pixmaps grow with the square of the device pixel ratio, the default 10MB fills quickly on HiDPI screens
+        screen = QApplication.primaryScreen()
+        device_pixel_ratio = screen.devicePixelRatio() if screen is not None else 1.0
+        QPixmapCache.setCacheLimit(int(32 * 1024 * max(1.0, device_pixel_ratio) ** 2))
+
         self.init_ui()
         self.setup_styles()
         QTimer.singleShot(100, self.initialize_app)
@@ -320,14 +579,18 @@ class GitAnalyzerGUI(QMainWindow):
 
         self.analysis_page = self.create_analysis_page()
         self.stacked_widget.addWidget(self.analysis_page)
-        self.diff_page = self.create_diff_page()
-        self.stacked_widget.addWidget(self.diff_page)
+        # placeholder at Page.DIFF, switch_page swaps in the real diff page on first use
+        self.stacked_widget.addWidget(QWidget())
         self.local_page = self.create_local_page()
         self.stacked_widget.addWidget(self.local_page)
         
-        self.analyze_page_btn.clicked.connect(lambda: self.switch_page(0))
-        self.diff_page_btn.clicked.connect(lambda: self.switch_page(1))
-        self.local_page_btn.clicked.connect(lambda: self.switch_page(2))
+        self._nav_buttons = {
+            Page.ANALYZE: self.analyze_page_btn,
+            Page.DIFF: self.diff_page_btn,
+            Page.LOCAL: self.local_page_btn,
+        }
+        for page, button in self._nav_buttons.items():
+            button.clicked.connect(functools.partial(self.switch_page, page))
         
         self.main_layout.addWidget(self.main_content_widget)
         self.main_content_widget.setVisible(False)
@@ -352,7 +615,12 @@ class GitAnalyzerGUI(QMainWindow):
         self.token_input = QLineEdit()
         self.token_input.setPlaceholderText("GitHub Personal Access Token")
         self.token_input.setEchoMode(QLineEdit.EchoMode.Password)
-        self.token_input.textChanged.connect(self.on_token_change)
+        # typing emits textChanged per keystroke, the button state is only updated once the typing pauses
+        self._token_debounce = QTimer(self)
+        self._token_debounce.setSingleShot(True)
+        self._token_debounce.setInterval(50)
+        self._token_debounce.timeout.connect(self.on_token_change)
+        self.token_input.textChanged.connect(lambda: self._token_debounce.start())
         self.connect_btn = QPushButton("Connect")
         self.connect_btn.setObjectName("connectButton")
         self.connect_btn.clicked.connect(self.connect_to_github)
@@ -361,7 +629,8 @@ class GitAnalyzerGUI(QMainWindow):
         self.disconnect_btn.clicked.connect(self.disconnect_from_github)
         self.disconnect_btn.setVisible(False)
         self.connection_status = QLabel("Not Connected")
-        self.connection_status.setObjectName("statusError")
+        self.connection_status.setObjectName("connectionStatus")
+        self.connection_status.setProperty("state", "error")
         connection_layout.addWidget(self.token_input, 0, 0)
         connection_layout.addWidget(self.connect_btn, 0, 1)
         connection_layout.addWidget(self.disconnect_btn, 0, 1)
@@ -376,7 +645,11 @@ class GitAnalyzerGUI(QMainWindow):
         self.repo_combo.addItem("Select a Repository...")
         self.repo_combo.currentIndexChanged.connect(self.on_repo_selected)
         self.commit_list_widget = QListWidget()
-        self.commit_list_widget.itemSelectionChanged.connect(self.on_commit_selection_changed)
+        self._selection_debounce = QTimer(self)
+        self._selection_debounce.setSingleShot(True)
+        self._selection_debounce.setInterval(50)
+        self._selection_debounce.timeout.connect(self.on_commit_selection_changed)
+        self.commit_list_widget.itemSelectionChanged.connect(lambda: self._selection_debounce.start())
         self.best_practice_btn = QPushButton("Show Best Practice")
         self.best_practice_btn.clicked.connect(self.run_single_commit_analysis)
         self.best_practice_btn.setEnabled(False)
@@ -440,12 +713,12 @@ class GitAnalyzerGUI(QMainWindow):
         self.old_code_text = CodeTextEdit()
         self.old_code_text.setObjectName("codeInput")
         self.old_code_text.setPlaceholderText("Paste the OLD code here...")
-        self.old_code_text.textChanged.connect(lambda: self.limit_text_edit_lines(self.old_code_text, 200))
+        self.connect_line_limit(self.old_code_text, 200)
         
         self.new_code_text = CodeTextEdit()
         self.new_code_text.setObjectName("codeInput")
         self.new_code_text.setPlaceholderText("Paste the NEW code here...")
-        self.new_code_text.textChanged.connect(lambda: self.limit_text_edit_lines(self.new_code_text, 200))
+        self.connect_line_limit(self.new_code_text, 200)
         
         self.generated_diff_commit_text = QTextEdit()
         self.generated_diff_commit_text.setReadOnly(True)
@@ -499,9 +772,12 @@ class GitAnalyzerGUI(QMainWindow):
 
         self.unstaged_files_list = QListWidget()
         self.unstaged_files_list.setObjectName("filesList")
+        # every row is one line of text, so Qt can measure the first row instead of each one
+        self.unstaged_files_list.setUniformItemSizes(True)
         
         self.staged_files_list = QListWidget()
         self.staged_files_list.setObjectName("filesList")
+        self.staged_files_list.setUniformItemSizes(True)
 
         staging_buttons_layout = QVBoxLayout()
         staging_buttons_layout.setSpacing(10)
@@ -577,153 +853,45 @@ class GitAnalyzerGUI(QMainWindow):
         return page_widget
 
     def setup_styles(self):
-        self.setStyleSheet("""
-            QMainWindow { background-color: #111827; }
-            QWidget {
-                color: #9CA3AF;
-                font-family: 'Inter', 'Segoe UI', sans-serif;
-                font-size: 14px;
-            }
-            QGroupBox {
-                font-weight: 600; font-size: 16px; color: #E5E7EB;
-                border: 1px solid #374151; border-radius: 12px;
-                background-color: #1F2937;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin; subcontrol-position: top left;
-                padding: 4px 12px; left: 15px;
-                background-color: #374151;
-                color: #E5E7EB;
-                border-radius: 6px;
-            }
-            QLabel#headerTitle { font-size: 28px; font-weight: 700; color: #F9FAFB; }
-            QLabel#headerUsername { font-size: 24px; font-weight: 600; color: #F9FAFB; }
-            QLabel#avatarLabel { border-radius: 22px; }
-            QLabel#statusSuccess { color: #2DD4BF; }
-            QLabel#statusError { color: #F87171; }
-            QLabel#loadingLabel { font-size: 20px; color: #4B5563; font-weight: 600; }
-            QLabel#folderLabel { color: #9CA3AF; font-style: italic; padding-left: 10px; }
-            QLineEdit, QComboBox, QTextEdit, QListWidget {
-                border: 1px solid #4B5563;
-                border-radius: 8px; 
-                background-color: #374151;
-                color: #D1D5DB;
-                padding: 10px;
-            }
-            QTextEdit#codeInput {
-                font-family: 'Consolas', 'Courier New', monospace;
-                font-size: 13px;
-            }
-            QLineEdit:focus, QComboBox:focus, QTextEdit:focus, QListWidget:focus {
-                border-color: #2DD4BF;
-            }
-            QComboBox::drop-down { border: none; }
-            QComboBox QAbstractItemView {
-                background-color: #374151; border: 1px solid #4B5563;
-                selection-background-color: #2DD4BF;
-                selection-color: #111827;
-                padding: 4px;
-            }
-            QPushButton {
-                background-color: #4B5563; border: none;
-                color: #F9FAFB; padding: 10px;
-                border-radius: 8px; font-weight: 600;
-            }
-            QPushButton:hover { background-color: #6B7280; }
-            QPushButton:pressed { background-color: #4B5563; }
-            QPushButton:disabled { background-color: #374151; color: #6B7280; }
-            QPushButton#connectButton, #generate_from_diff_btn, #generate_commit_btn {
-                background-color: #2DD4BF; color: #111827;
-            }
-            QPushButton#connectButton:hover, #generate_from_diff_btn:hover, #generate_commit_btn:hover { background-color: #5EEAD4; }
-            QPushButton#disconnectButton {
-                background-color: #F87171; color: #111827;
-            }
-            QPushButton#disconnectButton:hover { background-color: #FCA5A5; }
-            QPushButton#navButton {
-                background-color: transparent;
-                border: 1px solid #4B5563;
-                padding: 8px 16px;
-            }
-            QPushButton#navButton:checked {
-                background-color: #374151;
-                border: 1px solid #2DD4BF;
-                color: #2DD4BF;
-            }
-            QPushButton#iconButton {
-                background-color: transparent;
-                border: 1px solid #4B5563;
-                padding: 8px;
-            }
-            QPushButton#iconButton:hover {
-                background-color: #374151;
-            }
-            QPushButton#commitButton {
-                background-color: #16A34A; /* Green */
-                color: #F9FAFB;
-            }
-            QPushButton#commitButton:hover {
-                background-color: #22C55E;
-            }
-            QStatusBar {
-                background-color: #1F2937; border-top: 1px solid #374151;
-            }
-            QMessageBox { background-color: #1F2937; }
-            QListWidget::item { 
-                padding: 8px; 
-                border-bottom: 1px solid #374151;
-            }
-            QListWidget::item:selected {
-                background-color: #374151; color: #2DD4BF;
-                border: none;
-            }
-            QListWidget, QListWidget#filesList { 
-                outline: 0px; 
-                border-radius: 8px;
-            }
-            QPushButton#stageButton {
-                background-color: #3B82F6;
-                color: #F9FAFB;
-            }
-            QPushButton#stageButton:hover {
-                background-color: #60A5FA;
-            }
-            QPushButton#stageAllButton {
-                background-color: transparent;
-                border: 1px solid #3B82F6;
-                color: #3B82F6;
-            }
-            QPushButton#stageAllButton:hover {
-                background-color: #374151;
-            }
-            QPushButton#unstageButton {
-                background-color: #F43F5E; /* Rose color */
-                color: #F9FAFB;
-            }
-            QPushButton#unstageButton:hover {
-                background-color: #FB7185;
-            }
-            QPushButton#unstageAllButton {
-                background-color: transparent;
-                border: 1px solid #F43F5E;
-                color: #F43F5E;
-            }
-            QPushButton#unstageAllButton:hover {
-                background-color: #374151;
-            }
-        """)
-
-    def switch_page(self, index):
-        self.stacked_widget.setCurrentIndex(index)
-        self.analyze_page_btn.setChecked(index == 0)
-        self.diff_page_btn.setChecked(index == 1)
-        self.local_page_btn.setChecked(index == 2)
-
-    def run_task_in_thread(self, task_function, on_result, on_error, *args, **kwargs):
+        self.setStyleSheet(_load_stylesheet())
+
+    def switch_page(self, page):
+        if page == Page.DIFF and self.diff_page is None:
+            self.diff_page = self.create_diff_page()
+            placeholder = self.stacked_widget.widget(Page.DIFF)
+            self.stacked_widget.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self.stacked_widget.insertWidget(Page.DIFF, self.diff_page)
+        self.stacked_widget.setCurrentIndex(page)
+        for nav_page, button in self._nav_buttons.items():
+            button.setChecked(nav_page == page)
+
+    def run_task_in_thread(self, task_function, on_result, on_error, *args, on_progress=None, task_key=None, **kwargs):
+        """
+        Run the task on the global thread pool
+        while a task with the same `task_key` is running another one isn't started, only the same kind is blocked
+        """
+        if task_key is not None:
+            if task_key in self._tasks_in_flight:
+                return False
+            self._tasks_in_flight.add(task_key)
         worker = Worker(task_function, *args, **kwargs)
+        if task_key is not None:
+            # connected before the callbacks, so a callback can start the same kind of task again
+            release = lambda *_: self._tasks_in_flight.discard(task_key)
+            worker.signals.result.connect(release)
+            worker.signals.error.connect(release)
+            worker.signals.finished.connect(release)
         worker.signals.result.connect(on_result)
         worker.signals.error.connect(on_error)
+        self._active_workers.add(worker)
+        worker.signals.finished.connect(lambda: self._active_workers.discard(worker))
+        if on_progress is not None:
+            # the task reports partial results through this callback
+            worker.kwargs["progress_callback"] = worker.signals.progress.emit
+            worker.signals.progress.connect(on_progress)
         QThreadPool.globalInstance().start(worker)
+        return True
 
     def initialize_app(self):
         token = config("GITHUB_ACCESS_TOKEN", default=None)
@@ -734,14 +902,14 @@ class GitAnalyzerGUI(QMainWindow):
             self.loading_label.setVisible(False)
             self.main_content_widget.setVisible(True)
 
-    def on_token_change(self, text):
+    def on_token_change(self):
         if not self.token:
-            self.connect_btn.setEnabled(bool(text.strip()))
+            self.connect_btn.setEnabled(bool(self.token_input.text().strip()))
 
     def update_connection_status(self, message, is_success):
         self.connection_status.setText(message)
-        self.connection_status.setObjectName("statusSuccess" if is_success else "statusError")
-        self.connection_status.style().unpolish(self.connection_status)
+        # the stylesheet matches on the state property, polishing the label alone applies the new color
+        self.connection_status.setProperty("state", "success" if is_success else "error")
         self.connection_status.style().polish(self.connection_status)
 
     def connect_to_github(self):
@@ -749,45 +917,57 @@ class GitAnalyzerGUI(QMainWindow):
         if not token: return
         self.connect_btn.setEnabled(False)
         self.connect_btn.setText("Connecting...")
-        self.run_task_in_thread(self._task_connect_and_load_all, self._on_connect_and_load_all_result, self._on_task_error, token=token)
+        self.run_task_in_thread(self._task_connect_and_load_all, self._on_connect_and_load_all_result, self._on_task_error, token=token, task_key="connect")
 
     def _task_connect_and_load_all(self, token):
         profile = GithubProfile()
         repo_handler = GithubRepo()
-        connection_ok = profile.test_github_connection(token)
-        if not connection_ok:
-            raise ConnectionError("Token may be invalid or network issue.")
+        # fetching the owner is the same /user request the connection test makes, a bad token returns None
+        # so it doubles as the test and saves a round trip, the avatar is loaded by the UI in parallel afterwards
         owner = profile._set_owner_name(token)
         if not owner:
-            raise ValueError("Failed to retrieve owner name.")
-        repos = repo_handler.get_user_repositories(token, owner)
-        avatar_data = None
-        if profile.avatar:
-            response = requests.get(profile.avatar, stream=True)
-            response.raise_for_status()
-            avatar_data = response.content
-        return (token, owner, avatar_data, repos)
+            raise ConnectionError("Token may be invalid or network issue.")
+        repos = self._repo_cache.get((token, owner))
+        if repos is None:
+            # sorted here, so the GUI thread only adds them to the combo
+            repos = sorted(
+                repo_handler.get_user_repositories(token, owner) or [],
+                key=lambda item: item[0].lower()
+            )
+        return (token, owner, profile.avatar, repos)
 
     def _on_connect_and_load_all_result(self, result):
-        token, owner, avatar_data, repos = result
+        token, owner, avatar_url, repos = result
+        # written here on the GUI thread, a disconnect clears it on this thread too so they can't interleave
+        self._repo_cache[(token, owner)] = repos
         self.token = token
         self.owner = owner
-        if avatar_data:
-            pixmap = QPixmap()
-            pixmap.loadFromData(avatar_data)
-            pixmap = pixmap.scaled(44, 44, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.avatar_label.setPixmap(pixmap)
+        if avatar_url:
+            self.load_avatar(avatar_url)
         self.username_label.setText(owner)
         self.title_label.setVisible(False)
         self.profile_widget.setVisible(True)
-        self.repo_combo.clear()
+        self.repo_combo.setUpdatesEnabled(False)
+        self.repo_combo.blockSignals(True)
+        try:
+            self.repo_combo.clear()
+            if repos:
+                self.repo_combo.addItems(["Select a Repository..."] + [name for name, _ in repos])
+                # the urls are only read back on selection, the view doesn't need a dataChanged for each one
+                model = self.repo_combo.model()
+                model.blockSignals(True)
+                try:
+                    for index, (_, url) in enumerate(repos, start=1):
+                        self.repo_combo.setItemData(index, url)
+                finally:
+                    model.blockSignals(False)
+            else:
+                self.repo_combo.addItem("No repositories found.")
+        finally:
+            self.repo_combo.blockSignals(False)
+            self.repo_combo.setUpdatesEnabled(True)
         if repos:
-            self.repo_combo.addItem("Select a Repository...")
-            for repo_dict in repos:
-                for name, url in repo_dict.items():
-                    self.repo_combo.addItem(name, userData=url)
-        else:
-            self.repo_combo.addItem("No repositories found.")
+            self.prefetch_commits([name for name, _ in repos[:PREFETCH_COMMITS_REPOS]])
         self.update_connection_status("✅ Connected", True)
         self.analysis_workflow_group.setEnabled(True)
         self.write_commit_group.setEnabled(True)
@@ -797,8 +977,98 @@ class GitAnalyzerGUI(QMainWindow):
         self.loading_label.setVisible(False)
         self.main_content_widget.setVisible(True)
 
+    def _avatar_cache_path(self, avatar_url):
+        # the scaled avatar is kept on disk between runs, next to the ETag it was downloaded with
+        cache_dir = Path(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation))
+        name = hashlib.blake2b(avatar_url.encode(), digest_size=16).hexdigest()
+        return cache_dir / "git-analyzer" / "avatars" / f"{name}.png"
+
+    def load_avatar(self, avatar_url):
+        # only the 44x44 version is kept, the full size image is dropped after scaling
+        cached_pixmap = QPixmapCache.find(avatar_url)
+        if cached_pixmap is not None:
+            self.avatar_label.setPixmap(cached_pixmap)
+            return
+
+        # reading the copy from the last run touches the disk, so it's done in a worker too
+        self.run_task_in_thread(
+            self._task_read_cached_avatar,
+            lambda result: self._on_cached_avatar_read(result, avatar_url),
+            lambda error: self._on_cached_avatar_read((None, None), avatar_url),
+            avatar_url=avatar_url
+        )
+
+    def _task_read_cached_avatar(self, avatar_url):
+        cache_path = self._avatar_cache_path(avatar_url)
+        etag_path = cache_path.with_suffix(".etag")
+        if not cache_path.exists():
+            return None, None
+        image = QImage(str(cache_path))
+        if image.isNull():
+            return None, None
+        return image, etag_path.read_bytes() if etag_path.exists() else None
+
+    def _on_cached_avatar_read(self, result, avatar_url):
+        image, etag = result
+        request = QNetworkRequest(QUrl(avatar_url))
+        if image is not None:
+            # show the one from the last run right away, the request below only checks if it changed
+            self._on_avatar_decoded(image, avatar_url)
+            if etag:
+                request.setRawHeader(b"If-None-Match", etag)
+        reply = self._network_manager.get(request)
+        reply.finished.connect(lambda: self._on_avatar_reply(reply, avatar_url))
+
+    def _on_avatar_reply(self, reply, avatar_url):
+        reply.deleteLater()
+        if reply.error() != QNetworkReply.NetworkError.NoError:
+            # the avatar is cosmetic, the app works fine without it
+            logger.warning(f"Could not load the avatar: {reply.errorString()}")
+            return
+        if reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute) == 304:
+            # not modified, the avatar from the disk cache is already shown
+            return
+        # decoding and smooth scaling happen in a worker, the GUI thread only converts the result
+        self.run_task_in_thread(
+            self._task_decode_avatar,
+            lambda image: self._on_avatar_decoded(image, avatar_url),
+            lambda error: logger.warning(f"Could not load the avatar: {error}"),
+            data=reply.readAll(), avatar_url=avatar_url, etag=bytes(reply.rawHeader(b"ETag"))
+        )
+
+    def _task_decode_avatar(self, data, avatar_url, etag):
+        # unlike QPixmap, QImage can be used outside the GUI thread
+        # the reader decodes straight to the final size, jpeg avatars are even downscaled while decoding
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        reader = QImageReader(buffer)
+        size = reader.size()
+        if size.isValid():
+            reader.setScaledSize(size.scaled(44, 44, Qt.AspectRatioMode.KeepAspectRatioByExpanding))
+        image = reader.read()
+        if image.isNull():
+            raise ValueError(f"The avatar isn't a valid image: {reader.errorString()}")
+
+        cache_path = self._avatar_cache_path(avatar_url)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            image.save(str(cache_path), "PNG")
+            if etag:
+                cache_path.with_suffix(".etag").write_bytes(etag)
+        except OSError as e:
+            logger.warning(f"Could not cache the avatar: {e}")
+        return image
+
+    def _on_avatar_decoded(self, image, avatar_url):
+        pixmap = QPixmap.fromImage(image)
+        QPixmapCache.insert(avatar_url, pixmap)
+        self.avatar_label.setPixmap(pixmap)
+
     def disconnect_from_github(self):
         self.token, self.owner = None, None
+        self._repo_cache.clear()
+        self._commits_cache.clear()
+        self._ai_cache.clear()
         self.token_input.clear()
         self.token_input.setEnabled(True)
         self.update_connection_status("Not Connected", False)
@@ -822,6 +1092,7 @@ class GitAnalyzerGUI(QMainWindow):
 
     def on_repo_selected(self, index):
         self.commit_list_widget.clear()
+        self._current_commit_texts, self._current_commits_key = [], None
         self.analysis_results_text.clear()
         self.best_practice_btn.setEnabled(False)
         self.analysis_group.setEnabled(False)
@@ -829,33 +1100,134 @@ class GitAnalyzerGUI(QMainWindow):
             self.load_commits()
 
     def on_commit_selection_changed(self):
-        self.best_practice_btn.setEnabled(len(self.commit_list_widget.selectedItems()) > 0)
+        # hasSelection doesn't build a list of the selected items like selectedItems does
+        self.best_practice_btn.setEnabled(self.commit_list_widget.selectionModel().hasSelection())
 
     def load_commits(self):
         repo = self.repo_combo.currentText()
         if not repo or repo == "Select a Repository...": return
         self.commit_list_widget.clear()
-        self.run_task_in_thread(self._task_load_commits, self._on_load_commits_result, self._on_task_error, repo=repo)
+        etag = None
+        cached = self._commits_cache.get((self.owner, repo))
+        if cached is not None:
+            # show the cached list right away, the request only asks GitHub if there are new commits
+            etag, cached_commits = cached
+            self.show_commits(cached_commits)
+        self.run_task_in_thread(
+            self._task_load_commits, self._on_load_commits_result, self._on_task_error,
+            token=self.token, owner=self.owner, repo=repo, etag=etag, task_key=f"load_commits:{repo}"
+        )
 
-    def _task_load_commits(self, repo):
+    def _task_load_commits(self, token, owner, repo, etag=None):
+        """The cache is written by the result slot on the GUI thread, after checking the account is still the same"""
         commit_handler = GithubCommit()
         repo_name = repo.split('/')[-1]
-        return commit_handler.get_repo_commits(self.token, self.owner, repo_name)
+        commits = commit_handler.get_repo_commits(token, owner, repo_name, etag=etag)
+        if commit_handler.not_modified:
+            # 304 doesn't count against the rate limit, and the cached list is already shown
+            return token, owner, repo, None, None
+        if commits is None:
+            return token, owner, repo, None, []
+        return token, owner, repo, commit_handler.etag, commits
+
+    def populate_list_widget(self, list_widget, texts, empty_text, data=None):
+        """
+        Fill the list in one batch instead of a relayout and repaint per item
+        `data` is stored on each item under Qt.ItemDataRole.UserRole, the empty text item has none
+        """
+        list_widget.setUpdatesEnabled(False)
+        list_widget.blockSignals(True)
+        try:
+            list_widget.clear()
+            if not texts:
+                list_widget.addItem(empty_text)
+            else:
+                # one insert for all rows, the data is set afterwards with the model quiet
+                # so the view isn't told about every row twice
+                list_widget.addItems(texts)
+                if data is not None:
+                    model = list_widget.model()
+                    model.blockSignals(True)
+                    try:
+                        for row, value in enumerate(data):
+                            list_widget.item(row).setData(Qt.ItemDataRole.UserRole, value)
+                    finally:
+                        model.blockSignals(False)
+        finally:
+            list_widget.blockSignals(False)
+            list_widget.setUpdatesEnabled(True)
 
-    def _on_load_commits_result(self, commits):
-        self.commit_list_widget.clear()
+    def prefetch_commits(self, repos):
+        self.run_task_in_thread(
+            self._task_prefetch_commits, lambda result: None,
+            lambda error: logger.warning(f"Could not prefetch the commits: {error}"),
+            token=self.token, owner=self.owner, repos=repos, task_key="prefetch_commits"
+        )
+
+    def _task_prefetch_commits(self, token, owner, repos):
+        def prefetch(repo):
+            if (owner, repo) in self._commits_cache:
+                return
+            commit_handler = GithubCommit()
+            try:
+                commits = commit_handler.get_repo_commits(token, owner, repo.split('/')[-1], all_pages=False)
+            except Exception:
+                # best effort, the repo is loaded normally when it's selected
+                return
+            # skip it if the user disconnected in the meantime
+            # no etag is kept for the partial list, so selecting the repo shows it at once and then fetches all pages
+            if commits is not None and self.token == token:
+                self._commits_cache[(owner, repo)] = (None, commits)
+
+        # the task_key allows one prefetch at a time, so this caps the requests of all of them
+        with ThreadPoolExecutor(max_workers=min(PREFETCH_WORKERS, len(repos))) as executor:
+            list(executor.map(prefetch, repos))
+
+    def _on_load_commits_result(self, result):
+        token, owner, repo, etag, commits = result
+        if token != self.token or owner != self.owner:
+            # disconnected or another account connected while it was loading
+            return
+        if commits:
+            self._commits_cache[(owner, repo)] = (etag, commits)
+        if commits is None or repo != self.repo_combo.currentText():
+            # unchanged, or another repo was selected while it was loading
+            return
+        self.show_commits(commits)
+
+    def show_commits(self, commits):
+        self._current_commit_texts, self._current_commits_key = commits or [], None
+        # the rows are "date/message", the message is split off once here instead of on every click
+        self.populate_list_widget(
+            self.commit_list_widget, commits, "No commits found.",
+            data=[commit.split('/', 1)[-1].strip() for commit in commits] if commits else None
+        )
         if commits:
-            self.commit_list_widget.addItems(commits)
             self.analysis_group.setEnabled(True)
-        else:
-            self.commit_list_widget.addItem("No commits found.")
 
     def run_ai_analysis(self):
-        items = [self.commit_list_widget.item(i).text() for i in range(self.commit_list_widget.count())]
-        if not items or "No commits found" in items[0]: return
+        items = self._current_commit_texts
+        if not items: return
+        if self._current_commits_key is None:
+            self._current_commits_key = self._ai_cache_key(items)
+        cache_key = self._current_commits_key
+        cached_analysis = self._ai_cache.get(cache_key)
+        if cached_analysis is not None:
+            # no worker needed, show it on the next event loop turn like a finished task would
+            QTimer.singleShot(0, lambda: self._on_ai_analysis_result(cached_analysis))
+            return
         self.analyze_commits_btn.setEnabled(False)
         self.analyze_commits_btn.setText("Analyzing...")
-        self.run_task_in_thread(analyze_commit_list_with_ai, self._on_ai_analysis_result, self._on_task_error, commit_messages=items)
+        self.run_task_in_thread(self._task_ai_analysis, self._on_ai_analysis_result, self._on_task_error, commit_messages=items, cache_key=cache_key, task_key="ai_analysis")
+
+    def _ai_cache_key(self, commit_messages):
+        # hash the commits so the cache doesn't keep a copy of every list as key
+        return hashlib.blake2b("\n".join(sorted(commit_messages)).encode(), digest_size=16).hexdigest()
+
+    def _task_ai_analysis(self, commit_messages, cache_key):
+        analysis = analyze_commit_list_with_ai(commit_messages)
+        self._ai_cache[cache_key] = analysis
+        return analysis
 
     def _on_ai_analysis_result(self, result):
         self.analysis_results_text.setText(result)
@@ -864,45 +1236,88 @@ class GitAnalyzerGUI(QMainWindow):
     
     def run_single_commit_analysis(self):
         selected = self.commit_list_widget.selectedItems()
-        if not selected: return
-        message = selected[0].text().split('/')[-1].strip()
+        message = selected[0].data(Qt.ItemDataRole.UserRole) if selected else None
+        if not message: return
         self.best_practice_btn.setEnabled(False)
         self.best_practice_btn.setText("Improving...")
         self.run_task_in_thread(commit_best_practice, lambda result: self._on_single_analysis_result(result, message), self._on_task_error, commit_message=message)
 
     def _on_single_analysis_result(self, result, original_message):
-        formatted_original = original_message.replace('\n', '<br>')
-        formatted_best = result.replace('\n', '<br>')
-        QMessageBox.information(self, "Commit Best Practice", f"- <b>Original:</b><br>{formatted_original}<br><br>- <b>Best Practice Version:</b><br>{formatted_best}")
+        # Qt parses the markdown itself, the code blocks keep the line breaks of the commit messages
+        message_box = QMessageBox(self)
+        message_box.setIcon(QMessageBox.Icon.Information)
+        message_box.setWindowTitle("Commit Best Practice")
+        message_box.setTextFormat(Qt.TextFormat.MarkdownText)
+        message_box.setText(f"**Original:**\n\n```\n{original_message}\n```\n\n**Best Practice Version:**\n\n```\n{result}\n```")
+        message_box.exec()
         self.best_practice_btn.setEnabled(True)
         self.best_practice_btn.setText("Show Best Practice")
 
     def run_write_commit_analysis(self):
+        # isEmpty is answered by the document, the text is only copied out when there is some
+        if self.commit_input_text.document().isEmpty(): return
         desc = self.commit_input_text.toPlainText().strip()
         if not desc: return
         self.generate_commit_btn.setEnabled(False)
         self.generate_commit_btn.setText("Generating...")
-        self.run_task_in_thread(write_commit_message, self._on_write_commit_result, self._on_task_error, message=desc)
+        self.generated_commit_text.clear()
+        self.run_task_in_thread(
+            self._task_stream_commit_message,
+            self._on_write_commit_result,
+            self._on_task_error,
+            on_progress=self._on_write_commit_progress,
+            message=desc
+        )
+
+    def _task_stream_commit_message(self, message, progress_callback):
+        chunks = []
+        for chunk in stream_write_commit_message(message):
+            chunks.append(chunk)
+            progress_callback(chunk)
+        return "".join(chunks).strip()
+
+    def _on_write_commit_progress(self, chunk):
+        # show the message while it's being generated
+        self.generated_commit_text.moveCursor(QTextCursor.MoveOperation.End)
+        self.generated_commit_text.insertPlainText(chunk)
 
     def _on_write_commit_result(self, result):
         self.generated_commit_text.setText(result)
         self.generate_commit_btn.setEnabled(True)
         self.generate_commit_btn.setText("Generate Commit Message")
 
+    def connect_line_limit(self, text_edit, max_lines):
+        # a paste emits textChanged for every block, so only check the limit once the edits stop for 100ms
+        timer = QTimer(text_edit)
+        timer.setSingleShot(True)
+        timer.setInterval(100)
+        timer.timeout.connect(lambda: self.limit_text_edit_lines(text_edit, max_lines))
+        text_edit.textChanged.connect(timer.start)
+
     def limit_text_edit_lines(self, text_edit, max_lines):
-        text = text_edit.toPlainText()
-        lines = text.split('\n')
-        if len(lines) > max_lines:
-            new_text = '\n'.join(lines[:max_lines])
-            cursor = text_edit.textCursor()
-            pos = cursor.position()
-            text_edit.setPlainText(new_text)
-            cursor.setPosition(min(pos, len(new_text)))
-            text_edit.setTextCursor(cursor)
+        # the block count is kept by the document, no need to copy and split the text on every keystroke
+        document = text_edit.document()
+        if document.blockCount() <= max_lines:
+            return
+        # cut everything after the end of the last allowed line
+        last_block = document.findBlockByNumber(max_lines - 1)
+        cursor = QTextCursor(document)
+        cursor.setPosition(last_block.position() + last_block.length() - 1)
+        cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
+        text_edit.blockSignals(True)
+        try:
+            cursor.removeSelectedText()
+        finally:
+            text_edit.blockSignals(False)
 
     def run_diff_analysis(self):
-        old_code = self.old_code_text.toPlainText().strip()
-        new_code = self.new_code_text.toPlainText().strip()
+        # the line limit is debounced, apply it now in case the last paste is still pending
+        self.limit_text_edit_lines(self.old_code_text, 200)
+        self.limit_text_edit_lines(self.new_code_text, 200)
+        old_code = new_code = ""
+        if not self.old_code_text.document().isEmpty() and not self.new_code_text.document().isEmpty():
+            old_code = self.old_code_text.toPlainText().strip()
+            new_code = self.new_code_text.toPlainText().strip()
         if not old_code or not new_code:
             QMessageBox.warning(self, "Input Required", "Please provide both the old and new code.")
             return
@@ -919,6 +1334,7 @@ class GitAnalyzerGUI(QMainWindow):
         folder_path = QFileDialog.getExistingDirectory(self, "Select Project Folder")
         if folder_path:
             self.current_project_path = folder_path
+            self.local_git_repo.reset_cache()
             self.selected_folder_label.setText(folder_path)
             self.refresh_local_btn.setEnabled(True)
             self.refresh_local_repo_view()
@@ -926,23 +1342,32 @@ class GitAnalyzerGUI(QMainWindow):
     def refresh_local_repo_view(self):
         if not self.current_project_path:
             return
-        self.status_bar.showMessage("Refreshing local changes...", 2000)
-        self.refresh_local_btn.setEnabled(False)
-        self.run_task_in_thread(self.local_git_repo._repo_init, self._on_get_local_changes_result, self._on_task_error, path=self.current_project_path)
+        # the status scan can take a while on big repositories, block the actions until it's done
+        self.status_bar.showMessage("Refreshing local changes...")
+        self.selected_folder_label.setText(f"{self.current_project_path} (refreshing...)")
+        self.set_local_actions_enabled(False)
+        self.run_task_in_thread(self.local_git_repo._repo_init, self._on_get_local_changes_result, self._on_task_error, path=self.current_project_path, task_key="local_status")
+
+    def set_local_actions_enabled(self, enabled):
+        for button in [
+            self.refresh_local_btn, self.stage_selected_btn, self.stage_all_btn,
+            self.unstage_selected_btn, self.unstage_all_btn, self.generate_from_staged_btn
+        ]:
+            button.setEnabled(enabled)
 
     def handle_stage_selected(self):
         selected_items = self.unstaged_files_list.selectedItems()
-        if not selected_items:
+        file_to_stage = selected_items[0].data(Qt.ItemDataRole.UserRole) if selected_items else None
+        if not file_to_stage:
             QMessageBox.information(self, "No Selection", "Please select a file to stage.")
             return
-        file_to_stage = selected_items[0].text().split('\t')[-1]
-        self.run_task_in_thread(self.local_git_repo._add_to_stage, self._on_stage_complete, self._on_task_error, file_name=file_to_stage)
+        self.run_task_in_thread(self.local_git_repo._add_to_stage, self._on_stage_complete, self._on_task_error, file_name=file_to_stage, task_key="local_index")
 
     def handle_stage_all(self):
-        if self.unstaged_files_list.count() == 0 or "No unstaged changes" in self.unstaged_files_list.item(0).text():
+        if self.unstaged_files_list.count() == 0 or self.unstaged_files_list.item(0).data(Qt.ItemDataRole.UserRole) is None:
             QMessageBox.information(self, "No Changes", "There are no unstaged files to stage.")
             return
-        self.run_task_in_thread(self.local_git_repo._add_all_to_stage, self._on_stage_complete, self._on_task_error)
+        self.run_task_in_thread(self.local_git_repo._add_all_to_stage, self._on_stage_complete, self._on_task_error, task_key="local_index")
 
     def _on_stage_complete(self, result):
         self.status_bar.showMessage("Staging successful!", 2000)
@@ -950,24 +1375,24 @@ class GitAnalyzerGUI(QMainWindow):
 
     def handle_unstage_selected(self):
         selected_items = self.staged_files_list.selectedItems()
-        if not selected_items:
+        file_to_unstage = selected_items[0].data(Qt.ItemDataRole.UserRole) if selected_items else None
+        if not file_to_unstage:
             QMessageBox.information(self, "No Selection", "Please select a file to unstage.")
             return
-        file_to_unstage = selected_items[0].text().split('\t')[-1]
-        self.run_task_in_thread(self.local_git_repo._remove_from_stage, self._on_unstage_complete, self._on_task_error, file_name=file_to_unstage)
+        self.run_task_in_thread(self.local_git_repo._remove_from_stage, self._on_unstage_complete, self._on_task_error, file_name=file_to_unstage, task_key="local_index")
 
     def handle_unstage_all(self):
-        if self.staged_files_list.count() == 0 or "No staged changes" in self.staged_files_list.item(0).text():
+        if self.staged_files_list.count() == 0 or self.staged_files_list.item(0).data(Qt.ItemDataRole.UserRole) is None:
             QMessageBox.information(self, "No Changes", "There are no staged files to unstage.")
             return
-        self.run_task_in_thread(self.local_git_repo._remove_all_from_stage, self._on_unstage_complete, self._on_task_error)
+        self.run_task_in_thread(self.local_git_repo._remove_all_from_stage, self._on_unstage_complete, self._on_task_error, task_key="local_index")
 
     def _on_unstage_complete(self, result):
         self.status_bar.showMessage("Unstaging successful!", 2000)
         self.refresh_local_repo_view()
 
     def run_staged_changes_analysis(self):
-        if not self.local_git_repo.staged_files_repo:
+        if not self.local_git_repo.staged_files:
             QMessageBox.information(self, "No Staged Changes", "There are no changes in the staging area to analyze.")
             return
         
@@ -1007,7 +1432,8 @@ class GitAnalyzerGUI(QMainWindow):
             self.local_git_repo._commit,
             self._on_commit_complete,
             self._on_task_error,
-            message=commit_message
+            message=commit_message,
+            task_key="local_index"
         )
 
     def _on_commit_complete(self, result):
@@ -1024,43 +1450,46 @@ class GitAnalyzerGUI(QMainWindow):
 
     def _on_get_local_changes_result(self, result: Tuple[list, list]):
         staged_files, unstaged_files = result
-        self.refresh_local_btn.setEnabled(True)
-        self.staged_files_list.clear()
-        self.unstaged_files_list.clear()
+        self.set_local_actions_enabled(True)
+        self.selected_folder_label.setText(self.current_project_path)
+        self.status_bar.clearMessage()
         self.generated_staged_commit_text.clear()
         self.commit_staged_btn.setEnabled(False)
 
-        if staged_files:
-            for file_info in staged_files:
-                display_text = f"{file_info['change_type']}\t{file_info['file_name']}"
-                self.staged_files_list.addItem(display_text)
-        else:
-            self.staged_files_list.addItem("No staged changes.")
-
-        if unstaged_files:
-            for file_info in unstaged_files:
-                display_text = f"{file_info['change_type']}\t{file_info['file_name']}"
-                self.unstaged_files_list.addItem(display_text)
-        else:
-            self.unstaged_files_list.addItem("No unstaged changes.")
+        self.populate_list_widget(
+            self.staged_files_list,
+            [f"{file_info['change_type']}\t{file_info['file_name']}" for file_info in staged_files],
+            "No staged changes.",
+            data=[file_info['file_name'] for file_info in staged_files]
+        )
+        self.populate_list_widget(
+            self.unstaged_files_list,
+            [f"{file_info['change_type']}\t{file_info['file_name']}" for file_info in unstaged_files],
+            "No unstaged changes.",
+            data=[file_info['file_name'] for file_info in unstaged_files]
+        )
 
-    def _on_task_error(self, error_tuple):
-        exctype, value, tb = error_tuple
-        print(tb)
-        QMessageBox.critical(self, "Error", f"An error occurred:\n{value}")
+    def _on_task_error(self, exc):
+        if DEBUG:
+            import traceback
+            traceback.print_exception(exc)
+        QMessageBox.critical(self, "Error", f"An error occurred:\n{exc}")
         # Reset UI state
         self.connect_btn.setEnabled(True)
         self.connect_btn.setText("Connect")
-        self.best_practice_btn.setEnabled(len(self.commit_list_widget.selectedItems()) > 0)
+        self.on_commit_selection_changed()
         self.best_practice_btn.setText("Show Best Practice")
         self.analyze_commits_btn.setEnabled(self.analysis_group.isEnabled())
         self.analyze_commits_btn.setText("Analyze All Commits")
         self.generate_commit_btn.setEnabled(True)
         self.generate_commit_btn.setText("Generate Commit Message")
-        self.generate_from_diff_btn.setEnabled(True)
-        self.generate_from_diff_btn.setText("Generate Commit Message from Diff")
+        if self.generate_from_diff_btn:
+            self.generate_from_diff_btn.setEnabled(True)
+            self.generate_from_diff_btn.setText("Generate Commit Message from Diff")
         if self.refresh_local_btn:
-            self.refresh_local_btn.setEnabled(True)
+            self.set_local_actions_enabled(self.current_project_path is not None)
+            if self.current_project_path:
+                self.selected_folder_label.setText(self.current_project_path)
         if self.generate_from_staged_btn:
             self.generate_from_staged_btn.setEnabled(True)
             self.generate_from_staged_btn.setText("Generate Commit from Staged")
@@ -1069,7 +1498,17 @@ class GitAnalyzerGUI(QMainWindow):
             self.commit_staged_btn.setText("Commit")
 
     def closeEvent(self, event):
-        QThreadPool.globalInstance().waitForDone()
+        if "_mock_cancelled" in globals():
+            _mock_cancelled.set()
+        # drop the tasks that haven't started and the results of the running ones
+        pool = QThreadPool.globalInstance()
+        pool.clear()
+        for worker in list(self._active_workers):
+            worker.cancel()
+        # a slow GitHub or Gemini call shouldn't keep the window open, give them 2 seconds at most
+        pool.waitForDone(2000)
+        if GITHUB_SESSION is not None:
+            GITHUB_SESSION.close()
         event.accept()
 
 if __name__ == '__main__':
@@ -1,17 +1,21 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 import re
-import os
+import time
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Tuple
+from datetime import datetime , timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
 # third party
-import asyncio
-import aiohttp
 from decouple import config
-from icecream import ic
-from typing import Optional , Literal , Iterator , Tuple
-from dataclasses import dataclass
-from git import Repo , InvalidGitRepositoryError
+from typing import Optional , Iterator , Tuple
+from dataclasses import dataclass , field
 # local
 from github.urls import (
     GITHUB_COMMIT_URL,
@@ -23,25 +27,229 @@ from github.exceptions import (
 )
 from github.utils import get_page_number
 
+try :
+    # optional, without it every call goes to GitHub
+    import requests_cache
+except ImportError :
+    requests_cache = None
+
+try :
+    # optional, parses the big commit pages a few times faster than the json module
+    from orjson import loads as json_loads
+except ImportError :
+    from json import loads as json_loads
+
 
 logger = logging.getLogger(__name__)
+
+# what `from github.handler import *` (the package __init__) exposes
+__all__ = ["GithubProfile" , "GithubRepo" , "GithubCommit" , "SESSION"]
+
+# wait for the rate limit window to reset when fewer requests than this are left
+RATE_LIMIT_MIN_REMAINING = 5
+# never block a worker longer than this on a rate limit, in seconds
+RATE_LIMIT_MAX_WAIT = 60
+# (connect, read) timeouts in seconds, requests waits forever without one
+REQUEST_TIMEOUT = (3.05 , 10)
+# GitHub responses are kept in ~/.git-analyzer when requests-cache is installed, set GIT_ANALYZER_NO_HTTP_CACHE=1 to turn it off
+HTTP_CACHE_ENABLED = requests_cache is not None and not config("GIT_ANALYZER_NO_HTTP_CACHE", default=False, cast=bool)
+# used when GitHub doesn't send a Cache-Control header, in seconds
+HTTP_CACHE_EXPIRE = 300
+# the commit pages after the first are fetched at the same time, capped to stay under the GitHub secondary rate limit
+# the pool is shared by every GithubCommit, so loads running side by side don't multiply the requests in flight
+MAX_PAGE_WORKERS = 8
+_page_executor = ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS, thread_name_prefix="github-pages")
+# the later commit pages are revalidated with their ETag, (url, page, per_page) -> (etag, commits)
+PAGE_CACHE_SIZE = 256
+_page_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_page_cache_lock = threading.Lock()
+# token -> (etag, owner, avatar), /user is still asked on every connect so a revoked token is noticed
+# but with the ETag an unchanged user is a 304 that doesn't count against the rate limit
+OWNER_CACHE_SIZE = 8
+_owner_cache : "OrderedDict[str, tuple]" = OrderedDict()
+# <url>; rel="next" entries of the Link header, rel names are case insensitive
+_LINK_RE = re.compile(r'<([^>]+)>;\s*rel="(next|last|first|prev)"', re.IGNORECASE)
+
+
+class _RateLimiter :
+    """
+        Keeps the primary rate limit GitHub reports, shared by every thread using the session
+        each request takes one from `remaining` before it's sent, so concurrent page fetches
+        wait for the reset together instead of all going out and getting a 403
+    """
+
+    def __init__(self) -> None :
+        self._lock = threading.Lock()
+        self.remaining : Optional[int] = None
+        self.reset_ts : float = 0.0
+
+    def update(self , response:requests.Response) -> None :
+        """Take the limit from the headers of a response"""
+        remaining = response.headers.get("X-RateLimit-Remaining" , None)
+        if remaining is None :
+            return
+        with self._lock :
+            self.remaining = int(remaining)
+            self.reset_ts = float(response.headers.get("X-RateLimit-Reset" , 0))
+
+    def acquire(self) -> None :
+        """Wait for the window to reset when fewer than RATE_LIMIT_MIN_REMAINING requests are left"""
+        with self._lock :
+            if self.remaining is None or self.remaining >= RATE_LIMIT_MIN_REMAINING :
+                if self.remaining is not None :
+                    self.remaining -= 1
+                return
+            wait = self.reset_ts - time.time()
+            if wait <= 0 :
+                # the window was reset, the next response reports the new limit
+                self.remaining = None
+                return
+        wait = min(wait , RATE_LIMIT_MAX_WAIT)
+        logger.warning(f"Only {self.remaining} GitHub requests left, waiting {wait:.0f} seconds for the reset")
+        time.sleep(wait)
+
+
+_rate_limiter = _RateLimiter()
+
+
+class _RateLimitedAdapter(HTTPAdapter) :
+    """Adapter that waits on the rate limiter before a request goes out, responses from the cache never get here"""
+
+    def send(self , request , *args , **kwargs) -> requests.Response :
+        _rate_limiter.acquire()
+        return super().send(request , *args , **kwargs)
+
+
+def _retry_after_seconds(retry_after:str) -> Optional[float] :
+    """Retry-After is either a number of seconds or an HTTP date, None when it's neither"""
+    try :
+        return float(retry_after)
+    except ValueError :
+        pass
+    try :
+        return (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+    except (TypeError , ValueError) :
+        return None
+
+
+def _respect_rate_limit(response:requests.Response , *args , session:requests.Session , **kwargs) -> requests.Response :
+    """
+        Response hook of the shared session
+        the rate limit headers are passed to the limiter, and a 403/429 for a rate limit is waited out and retried once
+        Retry-After for the secondary limit, the window reset when the primary one is used up
+    """
+    # the rate limit headers of a cached response are stale
+    if getattr(response , "from_cache" , False) :
+        return response
+
+    _rate_limiter.update(response)
+    if response.status_code not in (403 , 429) or getattr(response.request , "rate_limit_retried" , False) :
+        return response
+
+    retry_after = response.headers.get("Retry-After" , None)
+    retry_after = _retry_after_seconds(retry_after) if retry_after is not None else None
+    if retry_after is not None :
+        wait = min(max(retry_after , 0) , RATE_LIMIT_MAX_WAIT)
+        logger.warning(f"GitHub secondary rate limit hit, retrying in {wait:.0f} seconds")
+    elif response.headers.get("X-RateLimit-Remaining" , None) == "0" or "Retry-After" in response.headers :
+        wait = min(max(int(response.headers.get("X-RateLimit-Reset" , 0)) - time.time() , 0) , RATE_LIMIT_MAX_WAIT)
+        logger.warning(f"GitHub rate limit used up, retrying in {wait:.0f} seconds")
+    else :
+        # a permission error, not a rate limit
+        return response
+
+    time.sleep(wait)
+    request = response.request.copy()
+    # the retry goes through the session again, this flag stops it from being retried a second time
+    request.rate_limit_retried = True
+    return session.send(request , **kwargs)
+
+
+def _http_cache_key(request:requests.PreparedRequest , **kwargs) -> str :
+    """
+        Cache key of the HTTP cache, requests-cache leaves the Authorization header out of its key
+        so a hash of the token is mixed in, every token gets its own entries and the token itself isn't written to disk
+    """
+    key = requests_cache.create_key(request , **kwargs)
+    token = request.headers.get("Authorization" , "")
+    return hashlib.blake2b(f"{key}|{token}".encode() , digest_size=16).hexdigest()
+
+
+def _create_session() -> requests.Session :
+    """
+        Create the session shared by the GitHub handlers
+        its connection pool keeps the TCP/TLS connection to api.github.com open between calls
+        with requests-cache the responses are stored and revalidated with their ETag, so a repeated call is a cheap 304
+    """
+    if HTTP_CACHE_ENABLED :
+        session = requests_cache.CachedSession(
+            cache_name=str(Path("~/.git-analyzer/http_cache").expanduser()),
+            backend="sqlite",
+            expire_after=HTTP_CACHE_EXPIRE,
+            cache_control=True,
+            # different tokens must not share their responses
+            key_fn=_http_cache_key,
+        )
+    else :
+        session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        # 429 is left to the rate limit hook, urllib3 would follow Retry-After without the RATE_LIMIT_MAX_WAIT cap
+        status_forcelist=[502, 503, 504],
+        # give the last response back so the handlers can check its status code as before
+        raise_on_status=False
+    )
+    # the token can change between calls so only the headers shared by every request are set here
+    session.headers.update({"Accept" : "application/vnd.github+json"})
+    session.mount("https://", _RateLimitedAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+    # the hook gets its session to send the retry through the same adapters, hooks and cache
+    session.hooks["response"].append(functools.partial(_respect_rate_limit , session=session))
+    return session
+
+
+SESSION = _create_session()
+
+
+@functools.lru_cache(maxsize=128)
+def _commit_url(owner:str , repo:str) -> str :
+    """The commits url of a repo, formatted once and reused for every page"""
+    return GITHUB_COMMIT_URL.format(owner=owner , repo=repo)
+
     
 class GithubProfile:
     
+    def __init__(self , session:Optional[requests.Session] = None) -> None:
+        self.session = session if session is not None else SESSION
+    
     def _set_owner_name(self , token:str) -> str | None :
-        """Set owner name to fetch further data"""
+        """Set owner name to fetch further data, this request also checks that the token is still valid"""
+        headers = {
+            "Authorization" : f"Bearer {token}",
+            # the HTTP cache has to ask GitHub too, a fresh cached copy would hide a revoked token
+            "Cache-Control" : "no-cache"
+        }
+        cached = _owner_cache.get(token , None)
+        if cached is not None :
+            headers["If-None-Match"] = cached[0]
+        
         try :
-            response = requests.get(
+            response = self.session.get(
                 url=GITHUB_USER_URL, 
-                headers =  {
-                    "Authorization" : f"Bearer {token}"
-                },
+                headers = headers,
                 params = {
                     "type" : "all"
-                }
+                },
+                timeout = REQUEST_TIMEOUT
             )
+            if response.status_code == 304 and cached is not None :
+                _ , owner_name , avatar = cached
+                setattr(self , "owner" , owner_name)
+                setattr(self , "avatar" , avatar)
+                return owner_name
+            
             if response.status_code == 200 :
-                data = response.json()
+                data = json_loads(response.content)
 
                 owner_name = data.get("login" , None)
                 avatar = data.get("avatar_url" , None)
@@ -51,9 +259,16 @@ class GithubProfile:
                 
                 setattr(self , "owner" , owner_name)
                 setattr(self , "avatar" , avatar)
+                etag = response.headers.get("ETag" , None)
+                if etag is not None :
+                    _owner_cache[token] = (etag , owner_name , avatar)
+                    _owner_cache.move_to_end(token)
+                    if len(_owner_cache) > OWNER_CACHE_SIZE :
+                        _owner_cache.popitem(last=False)
                 logger.info("User got the owner name successfully")
                 return owner_name
             else :
+                _owner_cache.pop(token , None)
                 return None
             
         except Exception as e :
@@ -64,14 +279,15 @@ class GithubProfile:
     def test_github_connection(self, token:str) -> bool :
         """test connection with the user token"""
         try :
-            response = requests.get(
+            response = self.session.get(
                 url=GITHUB_USER_URL, 
                 headers =  {
                     "Authorization" : f"Bearer {token}"
                 },
                 params = {
                     "type" : "all"
-                }
+                },
+                timeout = REQUEST_TIMEOUT
             )
             if response.status_code == 200 :
                 return True
@@ -89,18 +305,20 @@ class GithubProfile:
 @dataclass
 class GithubRepo :
     page : int = 1
-    per_page : int = 30
+    # the most GitHub returns in a page
+    per_page : int = 100
+    session : requests.Session = field(default=SESSION , repr=False)
     
-    def get_user_repositories(self , token:str , owner:str , page: Optional[int] = None , per_page : Optional[int] = None ) -> Iterator[str]:    
-        """Fetch user's repoistory list then pass to another function to set needed attrs"""
-        page_number =  page if page is not None else self.page,
+    def get_user_repositories(self , token:str , owner:str , page: Optional[int] = None , per_page : Optional[int] = None ) -> list[Tuple[str , str]]:    
+        """Fetch user's repoistory list as (owner/name , clone url) pairs"""
+        page_number =  page if page is not None else self.page
         per_page_number = per_page if per_page is not None else self.per_page
-        # Avoid getting more than 30 for single page repo
+        # Avoid getting more than 100 for single page repo
         
-        if per_page_number > 30 :
-            raise ValueError("Maximum repos to fetch in single page is 30") 
+        if per_page_number > 100 :
+            raise ValueError("Maximum repos to fetch in single page is 100") 
         
-        response = requests.get(
+        response = self.session.get(
             url = GITHUB_USERS_REPO_URL.format(),
             headers ={
             "Authorization" : f"Bearer {token}",
@@ -108,16 +326,18 @@ class GithubRepo :
             params =  {
                 "page" : page_number,
                 "per_page" : per_page_number
-            }
+            },
+            timeout = REQUEST_TIMEOUT
         )
-        ic(response.json())
-        repo_list = []
-        for repo in response.json() :
-            if response.status_code == 200 :
-                repo_list.append(
-                    {f"{owner}/{repo.get('name', '').lower()}" : f"{repo.get('clone_url')}"}
-                )
-        ic(repo_list)
+        if response.status_code != 200 :
+            return []
+        data = json_loads(response.content)
+        # %r is only formatted when debug logging is on, the response can be big
+        logger.debug("Repos of %s: %r" , owner , data)
+        # a tuple per repo, filled in place
+        repo_list = [None] * len(data)
+        for index , repo in enumerate(data) :
+            repo_list[index] = (f"{owner}/{repo.get('name', '').lower()}" , repo.get('clone_url'))
         logger.info(f"User got the repo list for the {owner} successfully")
         return repo_list
 
@@ -126,29 +346,46 @@ class GithubCommit:
     total_commits : int = 0
     commit_list : list = None 
     page : int = 1
-    per_page : int = 10
+    # the most GitHub returns in a page, fewer round trips for the same commits
+    per_page : int = 100
     next_pages : list = None
+    session : requests.Session = field(default=SESSION , repr=False)
+    # ETag of the first page, newer commits always change it
+    etag : str = None
+    not_modified : bool = False
     
-    def get_repo_commits(self , token:str , owner:str , repo:str , page : Optional[int] = None , per_page : Optional[int] = None) -> Iterator[str] :
+    def get_repo_commits(self , token:str , owner:str , repo:str , page : Optional[int] = None , per_page : Optional[int] = None , etag : Optional[str] = None , all_pages : bool = True) -> Iterator[str] :
+        """
+            Fetch the commit messages of the repo with all the next pages, only the first one without `all_pages`
+            when `etag` is given and the first page didn't change `not_modified` is set and None is returned
+        """
         page_number =  page if page is not None else self.page
         per_page_number = per_page if per_page is not None else self.per_page
+        headers = {
+            "Authorization" : f"Bearer {token}"
+        }
+        if etag is not None and page_number == 1 :
+            headers["If-None-Match"] = etag
         try :
-            response = requests.get(
-                url = GITHUB_COMMIT_URL.format(owner=owner , repo=repo),
-                headers = {
-                    "Authorization" : f"Bearer {token}"
-                },
+            response = self.session.get(
+                url = _commit_url(owner , repo),
+                headers = headers,
                 params = {
                     "page" : page_number,
                     "per_page" : per_page_number
-                }
+                },
+                timeout = REQUEST_TIMEOUT
             )
         except Exception as e:
             logger.error(f"{e} happened while fetching {repo} tokens")
             raise e
         
+        if response.status_code == 304 :
+            self.not_modified = True
+            return None
+        
         if response.status_code == 200 :
-            data = response.json()
+            data = json_loads(response.content)
             # When the status appear in the response there is not commit for the repo    
             if "status" in data :
                 raise EmptyCommitHistory
@@ -156,26 +393,80 @@ class GithubCommit:
             if self.commit_list is None :
                 self.commit_list = []
             
-            for commit in data :
-                commit_data = commit.get("commit" , None)
-                
-                # combine the commit data and message to saving it
-                if commit_data is not None :
-                    commit_message = commit_data.get("message")
-                    commit_date = commit_data.get("author" , None).get("date" , None)
-                    self.commit_list.append(f"{commit_date}/{commit_message}")
+            self.commit_list.extend(self._parse_commits(data))
             # get the next pages if they exist
             if page_number == 1 :
+                self.etag = response.headers.get("ETag" , None)
                 self.next_pages = []
                 next_page = response.headers.get("Link" , None)
-                self._get_next_pages(next_page , token , owner , repo , per_page_number)
+                if all_pages :
+                    self._get_next_pages(next_page , token , owner , repo , per_page_number)
         
             return self.commit_list
             
 
+    def _parse_commits(self , data:list) -> list :
+        """Combine the date and message of every commit in a page"""
+        try :
+            # every commit GitHub returns has these keys, indexing them is faster than the .get chain below
+            return [
+                f"{commit['commit']['author']['date']}/{commit['commit']['message']}"
+                for commit in data if "commit" in commit
+            ]
+        except (KeyError , TypeError) :
+            pass
+        
+        commits = []
+        for commit in data :
+            commit_data = commit.get("commit" , None)
+            
+            # combine the commit data and message to saving it
+            if commit_data is not None :
+                commit_message = commit_data.get("message")
+                commit_date = (commit_data.get("author" , None) or {}).get("date" , None)
+                commits.append(f"{commit_date}/{commit_message}")
+        return commits
+
+    def _fetch_page(self , url:str , headers:dict , page:int , per_page:int) -> list :
+        """
+            Fetch one of the next pages, runs on the page pool so it returns the commits instead of adding them
+            a page that was fetched before is sent with its ETag and a 304 reuses the commits parsed last time
+        """
+        key = (url , page , per_page)
+        with _page_cache_lock :
+            cached = _page_cache.get(key)
+        if cached is not None :
+            # the shared headers dict is used by the other pages too, so it's copied
+            headers = {**headers , "If-None-Match" : cached[0]}
+        
+        response = self.session.get(
+            url = url,
+            headers = headers,
+            params = {
+                "page" : page,
+                "per_page" : per_page
+            },
+            timeout = REQUEST_TIMEOUT
+        )
+        if response.status_code == 304 and cached is not None :
+            return cached[1]
+        if response.status_code != 200 :
+            return []
+        
+        commits = self._parse_commits(json_loads(response.content))
+        etag = response.headers.get("ETag" , None)
+        if etag is not None :
+            with _page_cache_lock :
+                _page_cache[key] = (etag , commits)
+                _page_cache.move_to_end(key)
+                if len(_page_cache) > PAGE_CACHE_SIZE :
+                    _page_cache.popitem(last=False)
+        return commits
+
     def _get_next_pages(self, link: str, token: str, owner: str, repo: str, per_page: int) -> None:
         """
         Fetches all remaining pages of commits based on the Link header
+        the pages are requested at the same time, so N pages cost about one round trip instead of N
         """
         # parse link headers
         page_info = self._parse_link_header(link)
@@ -184,9 +475,17 @@ class GithubCommit:
             return
 
         next_page, last_page = page_info
-        # loop through pages to fetch commits
-        for page in range(next_page, last_page + 1):
-            self.get_repo_commits(token, owner, repo, page, per_page)
+        pages = range(next_page, last_page + 1)
+        if not pages:
+            return
+        # the same for every page, so they're built once
+        url = _commit_url(owner, repo)
+        headers = {
+            "Authorization" : f"Bearer {token}"
+        }
+        # map gives the results back in page order, so the commits stay sorted
+        for commits in _page_executor.map(lambda page: self._fetch_page(url, headers, page, per_page), pages):
+            self.commit_list.extend(commits)
 
     def _parse_link_header(self, link_header: str) -> Optional[Tuple[int, int]]:
         """
@@ -198,8 +497,8 @@ class GithubCommit:
         # Regex to have dict of rel an url
         # TODO double check the regex it was created by AI
         rel_links = {
-            rel: url
-            for url, rel in re.findall(r'<([^>]+)>;\s*rel="([^"]+)"', link_header)
+            rel.lower(): url
+            for url, rel in _LINK_RE.findall(link_header)
         }
 
         next_url = rel_links.get("next")
@@ -215,160 +514,3 @@ class GithubCommit:
         except (KeyError, ValueError):
             # TODO handle cases where page param is missing or not an integer.
             return None
-        
-@dataclass
-class GitRepo:
-    _repo : Repo = None
-    staged_files : list = None
-    staged_files_repo : list = None
-    file_blobs : list[dict] = None
-        
-    def _repo(self , path:str) -> list:
-        """
-        Clone repo to local if path exists we pass it to another function
-        to create a instance from local 
-        """
-        # create path for clone if it does not exists
-        if not path :
-            raise ValueError("Path must be valid")
-        
-        directory_exists = self._directory_exist(path)
-        if directory_exists :
-            
-            try :
-                repo = Repo(path)
-                self._repo = repo
-            except InvalidGitRepositoryError :
-                return "Selected repo isn't valid"
-            
-            self._get_stage_changes(repo)
-        else :           
-            return "Invalid directory path"
-        
-        # get the staged and unstaged files data
-        return self._get_stage_files(repo) , self._get_unstaged_files(repo)
-
-        
-    def _directory_exist(self , path:str) -> bool:
-        """Check that path exists or not"""
-
-        path_exists = os.path.exists(path=path)
-
-        if not path_exists :
-            return False
-        return True
-            
-    def _get_stage_files(self , repo:Repo) -> list :
-        """get the file name of staged changes with the change type"""
-        # staged diff
-        staged_changes = repo.index.diff(repo.head.commit)
-        
-        files = []
-        # get the file name and change type of the file
-        for diff in staged_changes :
-            ic(diff.a_blob)
-            files.append(
-                {
-                "file_name" : diff.a_path,
-                "change_type" : diff.change_type
-                }
-            )
-        self._stage_files = files
-        return files
-    
-    def _get_stage_changes(self , repo:Repo) -> list[Repo]:
-        """Get the stage changes to write commit base on them"""
-    
-        # get staged changes diff
-        staged_changes = repo.index.diff(repo.head.commit)
-        
-        # add the diff objects to a list to reuse it later
-        stage_files = []
-        for diff in staged_changes:
-            stage_files.append(diff)
-
-        self._staged_files_repo = stage_files
-
-    def _get_unstaged_files(self , repo:Repo) -> list | None:
-        """Get unstaged files list"""
-        # get unstaged files
-        untracked_changes = repo.index.diff(None)
-        
-        if untracked_files :
-            untracked_files = [file.a_path for file in untracked_changes]
-        else :
-            return None
-
-        return untracked_files
-    
-    def _add_to_stage(self , repo:Repo , file_name:str ) -> None:
-        """Add file to staged changes"""
-        
-        if not file_name :
-            raise ValueError("File name is not valid")
-        
-        repo.index.add(file_name)
-        
-    
-    def _add_all_to_stage(self , repo:Repo) -> None :
-        """Stage all files"""
-        
-        repo.index.add(all=True)
-        
-    def _remove_from_stage(self , repo:Repo , file_name:str) -> None :
-        """Remove the file from staged changes"""
-                
-        if not file_name :
-            raise ValueError("File name is not valid")
-        
-        repo.index.remove(file_name)
-    
-    def _remove_all_from_stage(self , repo:Repo) -> None :
-        """Remove all messages from staged changes"""
-        
-        if not repo :
-            raise ValueError("Repo must be entered")
-        
-        repo.index.remove(all=True)
-    
-    
-    def decode_blob(self , diff:object) -> Tuple[str , str] :
-        """Decode a & b blobs to strings"""    
-        if diff.a_blob and not diff.b_blob :
-            raise ValueError("a_blob or b_blob must have value")
-        
-        # for deleted files the b_blob will be None
-        decoded_b_blob = diff.b_blob.data_stream.read().decode('utf-8') if diff.b_blob else "Deleted"            
-        
-        # for new files the a_blob will be None
-        decoded_a_blob = diff.a_blob.data_stream.read().decode('utf-8') if diff.a_blob else "New added"
-        
-        return decoded_a_blob , decoded_b_blob
-    
-
-    def _combine_all_blobs(self) -> list[dict] :
-        """Combine all diffs to analyze the staged changes commits"""
-        
-        combined_diffs = []
-        for diff in self._staged_files_repo :
-            # for new files a_path will be None
-            # we set file path to b_path it's more reliable to do
-            file_path = diff.b_path or diff.a_path
-            if not file_path :
-                raise ValueError("File path cannot be empty")
-            
-            old_content , new_content = self.decode_blob(diff)
-            # combine it
-            combined_diffs[file_path] = [old_content , new_content]
-            
-        return combined_diffs
-    
-    def _commit(self , message:str) -> bool :
-        """Commit generated commit message by AI for staged changes"""
-        
-        if not message :
-            return False
-        
-        self._repo.index.commit(message)
-        
-        return True
\ No newline at end of file
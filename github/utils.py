@@ -1,6 +1,12 @@
-from urllib.parse import urlparse , parse_qsl
-    
 def get_page_number(url: str) -> int:
-    query = urlparse(url).query
-    params = dict(parse_qsl(query))
-    return int(params["page"])
\ No newline at end of file
+    """Read the `page` query parameter without parsing the whole url"""
+    start = url.find("?")
+    while start != -1:
+        # skip the '?' or '&' so per_page= isn't taken for page=
+        start += 1
+        if url.startswith("page=", start):
+            start += len("page=")
+            end = url.find("&", start)
+            return int(url[start:] if end == -1 else url[start:end])
+        start = url.find("&", start)
+    raise KeyError("page")
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+from github import ai_analyzer
+
+
+class _StubModels:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, model, contents, config):
+        self.calls += 1
+        return SimpleNamespace(text="fix: stub", prompt_feedback=None, candidates=[])
+
+
+@pytest.fixture
+def models(monkeypatch):
+    models = _StubModels()
+    monkeypatch.setattr(ai_analyzer, "CACHE_ENABLED", False)
+    monkeypatch.setattr(ai_analyzer, "_client", lambda: SimpleNamespace(models=models))
+    return models
+
+
+def test_blank_lines_only_skip_the_model(models):
+    old_code = "a = 1\nb = 2\n"
+    new_code = "a = 1\n\n\nb = 2\n"
+    assert ai_analyzer.write_commit_base_on_diff(old_code, new_code) == ai_analyzer.WHITESPACE_COMMIT_MESSAGE
+    assert models.calls == 0
+
+
+def test_reindentation_reaches_the_model(models):
+    old_code = "if ready:\n    start()\n    stop()\n"
+    new_code = "if ready:\n    start()\nstop()\n"
+    assert ai_analyzer.write_commit_base_on_diff(old_code, new_code) == "fix: stub"
+    assert models.calls == 1
+
+
+def test_spaces_inside_strings_reach_the_model(models):
+    old_code = 'print("hello world")\n'
+    new_code = 'print("helloworld")\n'
+    assert ai_analyzer.write_commit_base_on_diff(old_code, new_code) == "fix: stub"
+    assert models.calls == 1
+
+
+def test_empty_stream_raises_and_is_not_cached(monkeypatch):
+    stored = []
+    blocked = SimpleNamespace(text=None, prompt_feedback=None, candidates=[SimpleNamespace(finish_reason="SAFETY")])
+    models = SimpleNamespace(generate_content_stream=lambda model, contents, config: iter([blocked]))
+    monkeypatch.setattr(ai_analyzer, "_client", lambda: SimpleNamespace(models=models))
+    monkeypatch.setattr(ai_analyzer, "_get_cached_response", lambda key: None)
+    monkeypatch.setattr(ai_analyzer, "_set_cached_response", lambda key, response: stored.append(response))
+    with pytest.raises(ValueError):
+        list(ai_analyzer.generate_ai_response_stream("prompt"))
+    assert stored == []
@@ -0,0 +1,25 @@
+import pytest
+import requests
+
+pytest.importorskip("requests_cache")
+
+from github.handler import SESSION, _http_cache_key
+from github.urls import GITHUB_USER_URL
+
+
+def _request(token:str) -> requests.PreparedRequest:
+    return requests.Request("GET", GITHUB_USER_URL, headers={"Authorization": f"Bearer {token}"}).prepare()
+
+
+def test_tokens_get_different_cache_keys():
+    assert _http_cache_key(_request("first")) != _http_cache_key(_request("second"))
+
+
+def test_same_token_gets_the_same_cache_key():
+    assert _http_cache_key(_request("first")) == _http_cache_key(_request("first"))
+
+
+def test_session_cache_uses_the_token_in_the_key():
+    if not hasattr(SESSION, "cache"):
+        pytest.skip("the HTTP cache is turned off")
+    assert SESSION.cache.create_key(_request("first")) != SESSION.cache.create_key(_request("second"))